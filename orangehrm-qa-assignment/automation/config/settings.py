@@ -13,6 +13,11 @@ class Settings:
     HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
     WINDOW_SIZE = os.getenv("WINDOW_SIZE", "1920,1080")
     IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "10"))
+    BROWSER_PROFILE = os.getenv("BROWSER_PROFILE", "default")
+    BROWSER_DATA_DIR = os.getenv("BROWSER_DATA_DIR", ".browser_profiles")
+    PIM_INDEX_MAX_ROWS = int(os.getenv("PIM_INDEX_MAX_ROWS", "2000"))
+    BLOCKED_URL_PATTERNS = [p.strip() for p in os.getenv("BLOCKED_URL_PATTERNS", "").split(",") if p.strip()]
+    NAV_PROFILE = os.getenv("NAV_PROFILE", "false").lower() == "true"
     
     # Test Accounts
     ADMIN_USER = {
@@ -23,7 +28,18 @@ class Settings:
     # Reporting
     SCREENSHOT_ON_FAILURE = os.getenv("SCREENSHOT_ON_FAILURE", "true").lower() == "true"
     VIDEO_RECORD = os.getenv("VIDEO_RECORD", "false").lower() == "true"
-    
+    LIVE_REPORT = os.getenv("LIVE_REPORT", "true").lower() == "true"
+    REPORT_DIR = os.getenv("REPORT_DIR", "results/report")
+    REPORT_STORE_DIR = os.getenv("REPORT_STORE_DIR", "results/store")
+    ALLURE_REPORT = os.getenv("ALLURE_REPORT", "false").lower() == "true"
+    ALLURE_REPORT_DIR = os.getenv("ALLURE_REPORT_DIR", "results/allure_report")
+
+    # Query Profiling
+    DB_PROFILE = os.getenv("DB_PROFILE", "false").lower() == "true"
+    DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+    DB_EXPLAIN_SLOW = os.getenv("DB_EXPLAIN_SLOW", "false").lower() == "true"
+    DB_REPEAT_THRESHOLD = int(os.getenv("DB_REPEAT_THRESHOLD", "10"))
+
     @property
     def login_url(self):
         return f"{self.BASE_URL}/web/index.php/auth/login"
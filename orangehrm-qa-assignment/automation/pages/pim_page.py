@@ -1,6 +1,15 @@
+import re
+import logging
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from config.settings import settings
+from utils.employee_index import EmployeeIndex, LookupFallback
 from .base_page import BasePage
 
+logger = logging.getLogger(__name__)
+
 class PIMPage(BasePage):
     # Locators
     PIM_MENU = (By.XPATH, "//span[text()='PIM']")
@@ -14,9 +23,33 @@ class PIMPage(BasePage):
     EMPLOYEE_RECORD = (By.CSS_SELECTOR, ".oxd-table-card")
     DELETE_BUTTON = (By.CSS_SELECTOR, "button[title='Delete']")
     CONFIRM_DELETE = (By.CSS_SELECTOR, ".oxd-button--label-danger")
+    TABLE_CELL = (By.CSS_SELECTOR, ".oxd-table-cell")
+    NEXT_PAGE_BUTTON = (By.CSS_SELECTOR, ".oxd-pagination-page-item--previous-next .bi-chevron-right")
+    PAGE_BUTTONS = (By.CSS_SELECTOR, ".oxd-pagination-page-item--page")
+    CURRENT_PAGE = (By.CSS_SELECTOR, ".oxd-pagination-page-item--page-selected")
+    RECORDS_FOUND = (By.XPATH, "//span[contains(normalize-space(), 'Record')]")
+    EMPLOYEE_LIST_PATH = "/pim/viewEmployeeList"
+
+    # Reads every card's cell texts in one round trip instead of one call per cell
+    READ_ROWS_SCRIPT = (
+        "return Array.from(document.querySelectorAll(arguments[0])).map("
+        "card => Array.from(card.querySelectorAll(arguments[1])).map(cell => cell.innerText.trim()));"
+    )
 
-    def __init__(self, driver):
+    # Column order of the Employee List table (first column is the row checkbox);
+    # the name column is "First (& Middle) Name"
+    LIST_COLUMNS = ("emp_id", "first_middle_name", "last_name", "job_title", "employment_status", "sub_unit", "supervisor")
+
+    def __init__(self, driver, lookup_fallback: LookupFallback = None):
         super().__init__(driver)
+        self.lookup_fallback = lookup_fallback
+        self._index = None
+        # Set once the list is known to exceed PIM_INDEX_MAX_ROWS, so lookups skip the count check
+        self._index_too_large = False
+
+    def _reset_index(self):
+        self._index = None
+        self._index_too_large = False
 
     def navigate_to_pim(self):
         self.click(self.PIM_MENU)
@@ -26,11 +59,36 @@ class PIMPage(BasePage):
         self.enter_text(self.FIRST_NAME_FIELD, first_name)
         self.enter_text(self.LAST_NAME_FIELD, last_name)
         self.click(self.SAVE_BUTTON)
+        self._reset_index()
 
     def search_employee(self, name):
-        self.click(self.EMPLOYEE_LIST_BUTTON)
+        if self.EMPLOYEE_LIST_PATH not in self.driver.current_url:
+            self.click(self.EMPLOYEE_LIST_BUTTON)
+            # Let the default listing render so it is not mistaken for the search results below
+            WebDriverWait(self.driver, settings.IMPLICIT_WAIT).until(
+                EC.presence_of_element_located(self.RECORDS_FOUND))
+        cards = self.driver.find_elements(*self.EMPLOYEE_RECORD)
+        labels = self.driver.find_elements(*self.RECORDS_FOUND)
+        old_card = cards[0] if cards else None
+        old_label = labels[0].text if labels else None
         self.enter_text(self.SEARCH_EMPLOYEE_NAME, name)
         self.click(self.SEARCH_BUTTON)
+        self._wait_for_results(old_card, old_label)
+
+    def _wait_for_results(self, old_card, old_label):
+        """Wait until the previous result cards are replaced or the records label changes"""
+        def refreshed(driver):
+            if old_card is not None and EC.staleness_of(old_card)(driver):
+                return True
+            labels = driver.find_elements(*self.RECORDS_FOUND)
+            return bool(labels) and labels[0].text != old_label
+        try:
+            WebDriverWait(self.driver, settings.IMPLICIT_WAIT).until(refreshed)
+        except TimeoutException:
+            # An empty result replaced by the same empty result leaves nothing to observe
+            if old_card is not None:
+                raise
+            logger.debug(f"Employee List still shows '{old_label}' after search")
 
     def verify_employee_in_list(self, name):
         employees = self.driver.find_elements(*self.EMPLOYEE_RECORD)
@@ -39,7 +97,86 @@ class PIMPage(BasePage):
                 return True
         return False
 
+    def get_employee_rows(self):
+        """Read the visible Employee List page into dicts keyed by LIST_COLUMNS"""
+        cards = self.driver.execute_script(self.READ_ROWS_SCRIPT, self.EMPLOYEE_RECORD[1], self.TABLE_CELL[1])
+        return [dict(zip(self.LIST_COLUMNS, cells[1:])) for cells in cards]
+
+    def get_record_count(self):
+        """Total matches reported by the "(N) Records Found" label"""
+        elements = self.driver.find_elements(*self.RECORDS_FOUND)
+        match = re.search(r"\((\d+)\)", elements[0].text) if elements else None
+        return int(match.group(1)) if match else 0
+
+    def get_current_page(self):
+        selected = self.driver.find_elements(*self.CURRENT_PAGE)
+        return int(selected[0].text) if selected else 1
+
+    def _click_and_wait(self, element):
+        """Click a pagination control and wait for the current result cards to be replaced"""
+        cards = self.driver.find_elements(*self.EMPLOYEE_RECORD)
+        element.click()
+        if cards:
+            WebDriverWait(self.driver, settings.IMPLICIT_WAIT).until(EC.staleness_of(cards[0]))
+
+    def go_to_page(self, page):
+        """Jump to a result page, stepping the visible page window only when the target is off-screen"""
+        while True:
+            current = self.get_current_page()
+            if current == page:
+                return
+            buttons = {int(b.text): b for b in self.driver.find_elements(*self.PAGE_BUTTONS) if b.text.strip().isdigit()}
+            if page in buttons:
+                self._click_and_wait(buttons[page])
+            elif buttons and page > current and max(buttons) > current:
+                self._click_and_wait(buttons[max(buttons)])
+            elif buttons and page < current and min(buttons) < current:
+                self._click_and_wait(buttons[min(buttons)])
+            else:
+                raise ValueError(f"Employee List page {page} is not reachable from page {current}")
+
+    def iter_employee_rows(self, start_page=1):
+        """Yield rows from every Employee List page from start_page on, following the next-page control"""
+        if start_page != 1:
+            self.go_to_page(start_page)
+        while True:
+            yield from self.get_employee_rows()
+            next_buttons = self.driver.find_elements(*self.NEXT_PAGE_BUTTON)
+            if not next_buttons:
+                return
+            self._click_and_wait(next_buttons[0])
+
+    def build_employee_index(self, refresh=False):
+        """Index the whole Employee List once per test; None when it exceeds PIM_INDEX_MAX_ROWS"""
+        if not refresh and (self._index is not None or self._index_too_large):
+            return self._index
+        self._reset_index()
+        self.search_employee("")
+        total = self.get_record_count()
+        if total > settings.PIM_INDEX_MAX_ROWS:
+            logger.info(f"Employee List has {total} records, above PIM_INDEX_MAX_ROWS; not indexing")
+            self._index_too_large = True
+            return None
+        self._index = EmployeeIndex(self.iter_employee_rows())
+        return self._index
+
+    def find_employee(self, name_or_id, prefix=False):
+        """Exact or prefix lookup by employee ID or full name.
+
+        Uses the in-memory index for lists up to PIM_INDEX_MAX_ROWS. Larger lists go to
+        the API/DB lookup_fallback when one is configured, otherwise to a UI search
+        whose result page is matched locally.
+        """
+        index = self.build_employee_index()
+        if index is not None:
+            return index.contains(name_or_id, prefix)
+        if self.lookup_fallback:
+            return self.lookup_fallback(name_or_id, prefix)
+        self.search_employee(name_or_id)
+        return EmployeeIndex(self.iter_employee_rows()).contains(name_or_id, prefix)
+
     def delete_employee(self, name):
         self.search_employee(name)
         self.click(self.DELETE_BUTTON)
         self.click(self.CONFIRM_DELETE)
+        self._reset_index()
@@ -1,5 +1,7 @@
 import pytest
 import os
+import sys
+import argparse
 from datetime import datetime
 
 def create_results_dir():
@@ -10,17 +12,25 @@ def create_results_dir():
     return results_dir
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the test suite with live reports")
+    parser.add_argument("--allure", action="store_true",
+                        help="generate the Allure HTML report in the background once the last test finishes")
+    args = parser.parse_args()
     results_dir = create_results_dir()
-    
-    # Run tests with HTML report
-    pytest.main([
+
+    # The tests/conftest.py hooks stream results into the store and keep the HTML report
+    # up to date while tests run, so nothing is rendered serially after the last test
+    os.environ.setdefault("REPORT_DIR", f"{results_dir}/report")
+    os.environ.setdefault("REPORT_STORE_DIR", f"{results_dir}/store")
+    os.environ.setdefault("ALLURE_REPORT_DIR", f"{results_dir}/allure_report")
+    if args.allure:
+        os.environ["ALLURE_REPORT"] = "true"
+
+    exit_code = pytest.main([
         "-v",
-        f"--html={results_dir}/test_report.html",
-        "--self-contained-html",
+        f"--alluredir={results_dir}/allure_results",
         "tests/"
     ])
-    
-    # Generate Allure report
-    if os.path.exists(f"{results_dir}/allure_results"):
-        os.system(f"allure generate {results_dir}/allure_results -o {results_dir}/allure_report --clean")
-        print(f"\nReports generated in: {os.path.abspath(results_dir)}")
+
+    print(f"\nReports generated in: {os.path.abspath(results_dir)}")
+    sys.exit(exit_code)
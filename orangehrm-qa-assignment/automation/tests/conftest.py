@@ -0,0 +1,104 @@
+import os
+import json
+import pytest
+from pathlib import Path
+from config.settings import settings
+from utils.query_profiler import query_profiler
+from utils.reporting import ReportBuilder, ResultStore, default_run_id
+
+_result_store = None
+
+PERFORMANCE_DIR = Path("results/performance")
+# Fixed names so the xdist controller can find and merge each worker's profiles
+WORKER_QUERY_REPORT = "query_profile.json"
+WORKER_NAVIGATION_TIMINGS = "navigation_timings.json"
+
+
+@pytest.fixture
+def browser(request):
+    """WebDriver using the profile from @pytest.mark.browser_profile or settings.BROWSER_PROFILE"""
+    from utils.driver_factory import DriverFactory
+    marker = request.node.get_closest_marker("browser_profile")
+    driver = DriverFactory.create(marker.args[0] if marker else None)
+    yield driver
+    driver.quit()
+
+
+def pytest_configure(config):
+    """Stream results to the store and start the background report builder.
+
+    Only the controlling process records: xdist workers forward their reports to it.
+    """
+    global _result_store
+    if not settings.LIVE_REPORT or hasattr(config, "workerinput"):
+        return
+    run_id = os.environ.get("REPORT_RUN_ID") or default_run_id()
+    _result_store = ResultStore(Path(settings.REPORT_STORE_DIR), run_id)
+    config._report_done = _result_store.done_path
+    # The builder also starts `allure generate` once the last result is in, when ALLURE_REPORT is set
+    allure_results = config.getoption("allure_report_dir", None) if settings.ALLURE_REPORT else None
+    config._report_builder = ReportBuilder.spawn(
+        _result_store.path, Path(settings.REPORT_DIR), config._report_done,
+        allure_results=Path(allure_results) if allure_results else None,
+        allure_output=Path(settings.ALLURE_REPORT_DIR)
+    )
+
+
+def pytest_runtest_logreport(report):
+    if _result_store:
+        _result_store.append(report)
+
+
+def _worker_files(name):
+    return sorted(PERFORMANCE_DIR.glob(f"gw*/{name}"))
+
+
+def pytest_sessionstart(session):
+    """Drop worker profiles left behind by an interrupted run"""
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        return
+    for stale in _worker_files(WORKER_QUERY_REPORT) + _worker_files(WORKER_NAVIGATION_TIMINGS):
+        stale.unlink()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Persist opted-in query (DB_PROFILE) and navigation (NAV_PROFILE) profiles.
+
+    xdist workers only write their raw profiles to results/performance/<worker>/. The controller,
+    which finishes after every worker, merges them into one report and alone updates the
+    navigation baseline.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if settings.DB_PROFILE:
+        if worker:
+            query_profiler.save_report(PERFORMANCE_DIR / worker, WORKER_QUERY_REPORT)
+        else:
+            for path in _worker_files(WORKER_QUERY_REPORT):
+                with open(path) as f:
+                    query_profiler.merge_report(json.load(f))
+                path.unlink()
+            query_profiler.save_report(PERFORMANCE_DIR)
+    if settings.NAV_PROFILE:
+        from utils.driver_factory import navigation_log
+        if worker:
+            navigation_log.save_timings(PERFORMANCE_DIR / worker / WORKER_NAVIGATION_TIMINGS)
+        else:
+            for path in _worker_files(WORKER_NAVIGATION_TIMINGS):
+                with open(path) as f:
+                    navigation_log.merge(json.load(f))
+                path.unlink()
+            navigation_log.save_report(PERFORMANCE_DIR)
+
+
+def pytest_unconfigure(config):
+    """Let the report builder render its last delta and exit"""
+    global _result_store
+    if _result_store is None:
+        return
+    _result_store.close()
+    _result_store = None
+    config._report_done.touch()
+    try:
+        config._report_builder.wait(timeout=30)
+    except Exception:
+        config._report_builder.kill()
@@ -1,19 +1,15 @@
 import pytest
-from selenium import webdriver
 from pages.login_page import LoginPage
 from pages.pim_page import PIMPage
 
 class TestEmployeeManagement:
     @pytest.fixture(autouse=True)
-    def setup(self):
-        self.driver = webdriver.Chrome()
-        self.driver.maximize_window()
+    def setup(self, browser):
+        self.driver = browser
         self.login_page = LoginPage(self.driver)
         self.pim_page = PIMPage(self.driver)
         # Login first
         self.login_page.login("Admin", "admin123")
-        yield
-        self.driver.quit()
 
     def test_add_employee(self):
         test_employee = ("John", "Doe")
@@ -0,0 +1,136 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+import pytest
+from utils.dashboard import DashboardHandler, LiveRecorder, ResultsRepository, SampleSeries, decimate, histogram, summarize
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    (tmp_path / "benchmark_20260101_000000.json").write_text(json.dumps({"raw_times": [0.1, 0.2, 0.3]}))
+    (tmp_path / "query_report_20260101_000000.json").write_text(json.dumps({"fingerprints": []}))
+    (tmp_path / "navigation_baseline.json").write_text("{}")
+    (tmp_path / "live").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def dashboard(results_dir):
+    DashboardHandler.repository = ResultsRepository(results_dir)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DashboardHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+class TestDecimate:
+    def test_short_series_is_unchanged(self):
+        assert decimate([3.0, 1.0], 10) == [(0, 3.0), (1, 1.0)]
+
+    def test_keeps_spikes(self):
+        values = [1.0] * 10_000
+        values[4321] = 50.0
+        values[8765] = -5.0
+        points = decimate(values, 200)
+        assert len(points) <= 200
+        assert (4321, 50.0) in points and (8765, -5.0) in points
+        assert [i for i, _ in points] == sorted(i for i, _ in points)
+
+    @pytest.mark.parametrize("max_points", [0, 1])
+    def test_rejects_fewer_than_two_points(self, max_points):
+        with pytest.raises(ValueError):
+            decimate([1.0, 2.0, 3.0], max_points)
+
+
+def test_histogram_counts_every_value():
+    result = histogram([0.0, 0.5, 1.0, 1.0], bins=2)
+    assert result["counts"] == [1, 3]
+    assert result["edges"] == [0.0, 0.5, 1.0]
+    assert histogram([2.0, 2.0], bins=4)["counts"] == [2, 0, 0, 0]
+    assert histogram([]) == {"edges": [], "counts": []}
+
+
+def test_summarize_interpolates_percentiles():
+    summary = summarize([float(v) for v in range(1, 101)])
+    assert summary["median"] == pytest.approx(50.5)
+    assert summary["p90"] == pytest.approx(90.1)
+    assert summary["max"] == 100.0
+    assert summarize([]) == {}
+
+
+def test_sample_series_stays_in_step_with_full_recompute():
+    values = [float((v * 37) % 101) for v in range(1, 500)]
+    series = SampleSeries(values[:100])
+    for start in range(100, len(values), 57):
+        series.extend(values[start:start + 57])
+    assert series.values == values
+    assert series.summary() == pytest.approx(summarize(values))
+    assert series.histogram(7) == histogram(values, bins=7)
+
+
+class TestResultsRepository:
+    def test_lists_only_benchmark_results(self, results_dir):
+        repository = ResultsRepository(results_dir)
+        assert repository.list() == {"stored": ["benchmark_20260101_000000.json"], "live": []}
+        with pytest.raises(ValueError):
+            repository.stored_series("query_report_20260101_000000.json")
+
+    def test_live_series_reads_appended_lines(self, results_dir):
+        repository = ResultsRepository(results_dir)
+        log = results_dir / "live" / "run.log"
+        log.write_text("1.0 0.5\n2.0 0.7\n3.0 0.")
+        series = repository.live_series("run")
+        assert series.values == [0.5, 0.7]
+        with open(log, "a") as f:
+            f.write("9\n")
+        assert repository.live_series("run") is series
+        assert series.values == [0.5, 0.7, 0.9]
+        assert series.summary()["max"] == 0.9
+
+    def test_restarted_run_replaces_samples(self, results_dir):
+        repository = ResultsRepository(results_dir)
+        with LiveRecorder("run", results_dir / "live", flush_interval=0) as recorder:
+            for latency in (0.1, 0.2):
+                recorder.record(latency)
+        assert repository.live_series("run").values == [0.1, 0.2]
+        # The new run has already grown past the old read position by the next poll
+        with LiveRecorder("run", results_dir / "live", flush_interval=0) as recorder:
+            for latency in (0.5, 0.6, 0.7, 0.8):
+                recorder.record(latency)
+        assert repository.live_series("run").values == [0.5, 0.6, 0.7, 0.8]
+
+    def test_rejects_names_outside_results_dir(self, results_dir):
+        with pytest.raises(ValueError):
+            ResultsRepository(results_dir).live_series("../benchmark_20260101_000000")
+
+
+class TestDashboardHandler:
+    def test_series(self, dashboard):
+        status, body = get(f"{dashboard}/api/series?name=benchmark_20260101_000000.json&points=2")
+        assert status == 200
+        assert body["summary"]["count"] == 3
+        assert len(body["points"]) == 2
+
+    @pytest.mark.parametrize("query", ["points=1", "points=abc", "points=2"])
+    def test_bad_requests_get_400(self, dashboard, query):
+        name = "&name=benchmark_20260101_000000.json" if query != "points=2" else ""
+        status, body = get(f"{dashboard}/api/series?{query}{name}")
+        assert status == 400
+        assert "error" in body
+
+    def test_results(self, dashboard):
+        assert get(f"{dashboard}/api/results") == (200, {"stored": ["benchmark_20260101_000000.json"], "live": []})
@@ -0,0 +1,115 @@
+import json
+import socket
+import threading
+import time
+import pytest
+from utils.distributed_load import LatencyHistogram, LoadCoordinator, LoadWorker, _target_path
+
+pytestmark = pytest.mark.unit
+
+
+def slow_target():
+    time.sleep(0.05)
+
+
+class TestLatencyHistogram:
+    def test_percentiles_within_bucket_accuracy(self):
+        histogram = LatencyHistogram()
+        for latency in range(1, 101):
+            histogram.record(latency)
+        assert histogram.count == 100
+        assert histogram.mean == pytest.approx(50.5)
+        assert histogram.percentile(50) == pytest.approx(50, rel=0.03)
+        assert histogram.percentile(99) == pytest.approx(99, rel=0.03)
+
+    def test_merge_matches_single_histogram(self):
+        combined, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for latency in (1, 5, 20, 80, 300):
+            combined.record(latency)
+            (left if latency < 50 else right).record(latency)
+        left.merge(right)
+        assert left.counts == combined.counts
+        assert left.percentile(90) == combined.percentile(90)
+
+    def test_round_trips_through_json(self):
+        histogram = LatencyHistogram()
+        histogram.record(12.5)
+        restored = LatencyHistogram.from_dict(json.loads(json.dumps(histogram.to_dict())))
+        assert restored.counts == histogram.counts
+        assert restored.total_ms == histogram.total_ms
+
+    def test_empty(self):
+        assert LatencyHistogram().percentile(99) == 0.0
+        assert LatencyHistogram().mean == 0.0
+
+
+def test_target_must_be_importable():
+    assert _target_path(slow_target) == f"{__name__}:slow_target"
+    with pytest.raises(ValueError):
+        _target_path(lambda: None)
+
+
+def test_overloaded_worker_bounds_queue_and_finishes_on_time():
+    """2 threads x 50ms serve 40 calls/s; at 200/s the excess must be dropped, not queued"""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        worker = LoadWorker("127.0.0.1:{}".format(server.getsockname()[1]), "w0", concurrency=2, queue_depth=2)
+        thread = threading.Thread(target=worker.run, daemon=True)
+        thread.start()
+        conn, _ = server.accept()
+        with conn, conn.makefile("rw") as stream:
+            assert json.loads(stream.readline())["type"] == "hello"
+            start_at = time.monotonic()
+            stream.write(json.dumps({"target": f"{__name__}:slow_target", "rate": 200, "duration": 1,
+                                     "report_interval": 0.2, "start_in": 0, "drain_timeout": 5}) + "\n")
+            stream.flush()
+            histogram, dropped, cancelled = LatencyHistogram(), 0, 0
+            for line in stream:
+                message = json.loads(line)
+                if message["type"] == "done":
+                    break
+                histogram.merge(LatencyHistogram.from_dict(message["histogram"]))
+                dropped += message["dropped"]
+                cancelled += message["cancelled"]
+        finished = time.monotonic() - start_at
+        thread.join(timeout=5)
+
+    assert message["issued"] == 200
+    assert message["unfinished"] == 0
+    assert finished < 1.5
+    assert histogram.count + dropped + cancelled == 200
+    assert 30 <= histogram.count <= 45
+    # Queue wait counts: with two calls queued behind two running ones, latency approaches 2 x 50ms
+    assert histogram.percentile(90) > 80
+
+
+def test_coordinator_skips_connections_without_valid_hello():
+    coordinator = LoadCoordinator(f"{__name__}:slow_target", workers=0, remote_workers=1,
+                                  connect_timeout=5, handshake_timeout=0.3)
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        address = server.getsockname()
+        closed = socket.create_connection(address)
+        closed.close()
+        garbage = socket.create_connection(address)
+        garbage.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        silent = socket.create_connection(address)
+        impostor = socket.create_connection(address)
+        impostor.sendall(b'{"type": "summary", "worker": "x"}\n')
+        worker = socket.create_connection(address)
+        worker.sendall(b'{"type": "hello", "worker": "w0"}\n')
+
+        connections = coordinator._accept_workers(server)
+        for sock in (garbage, silent, impostor, worker):
+            sock.close()
+        for conn in connections:
+            conn.close()
+
+    assert list(connections.values()) == ["w0"]
+    assert list(coordinator.workers) == ["w0"]
+
+
+def test_coordinator_gives_up_after_connect_timeout():
+    coordinator = LoadCoordinator(f"{__name__}:slow_target", workers=0, remote_workers=1,
+                                  connect_timeout=0.3, handshake_timeout=0.1)
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        with pytest.raises(TimeoutError, match="0/1"):
+            coordinator._accept_workers(server)
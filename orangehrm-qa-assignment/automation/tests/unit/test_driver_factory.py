@@ -0,0 +1,120 @@
+import json
+import pytest
+from config.settings import settings
+from utils import driver_factory
+from utils.driver_factory import DriverFactory, NavigationLog, PROFILES
+
+pytestmark = pytest.mark.unit
+
+
+class FakeDriver:
+    def __init__(self, options=None):
+        self.options = options
+        self.visited = []
+        self.cdp = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+
+    def quit(self):
+        pass
+
+    @property
+    def data_dir(self):
+        argument = next((a for a in self.options.arguments if a.startswith("--user-data-dir=")), None)
+        return argument and argument.split("=", 1)[1]
+
+
+@pytest.fixture
+def log(tmp_path):
+    return NavigationLog(baseline_path=tmp_path / "navigation_baseline.json")
+
+
+class TestNavigationLog:
+    def test_report_compares_profiles_with_default(self, log):
+        log.record("default", "https://hrm.example/web/index.php/auth/login", 900)
+        log.record("fast", "https://hrm.example/web/index.php/auth/login", 400)
+        report = log.report()
+        assert report["fast"]["/web/index.php/auth/login"]["saved_ms"] == 500
+        assert "saved_ms" not in report["default"]["/web/index.php/auth/login"]
+
+    def test_merge_and_save_refresh_baseline_once(self, log, tmp_path):
+        worker = NavigationLog(baseline_path=log.baseline_path)
+        worker.record("default", "https://hrm.example/a", 100)
+        worker.save_timings(tmp_path / "gw0" / "navigation_timings.json")
+        assert not log.baseline_path.exists()
+
+        with open(tmp_path / "gw0" / "navigation_timings.json") as f:
+            log.merge(json.load(f))
+        log.record("default", "https://hrm.example/a", 300)
+        assert log.save_report(tmp_path) is not None
+        with open(log.baseline_path) as f:
+            assert json.load(f) == {"/a": 200}
+
+    def test_nothing_written_without_timings(self, log, tmp_path):
+        assert log.save_report(tmp_path) is None
+        assert log.save_timings(tmp_path / "timings.json") is None
+
+
+class TestDriverFactory:
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError, match="Unknown browser profile"):
+            DriverFactory.get_profile("turbo")
+
+    def test_persistent_chrome_profile_gets_data_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "BROWSER", "chrome")
+        monkeypatch.setattr(settings, "BROWSER_DATA_DIR", str(tmp_path))
+        data_dir = DriverFactory._acquire_data_dir(PROFILES["fast"])
+        arguments = DriverFactory._chrome_options(PROFILES["fast"], data_dir).arguments
+        assert any(a.startswith("--user-data-dir=") for a in arguments)
+        assert not any(a.startswith("--user-data-dir=")
+                       for a in DriverFactory._chrome_options(PROFILES["default"]).arguments)
+
+    @pytest.mark.parametrize("browser, warmed", [("chrome", True), ("firefox", False)])
+    def test_warm_up_only_for_persistent_profiles(self, monkeypatch, tmp_path, browser, warmed):
+        monkeypatch.setattr(settings, "BROWSER", browser)
+        monkeypatch.setattr(settings, "BROWSER_DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(driver_factory.webdriver, "Chrome", FakeDriver)
+        monkeypatch.setattr(driver_factory.webdriver, "Firefox", FakeDriver)
+        driver = DriverFactory.create("fast", record_navigation=False)
+        assert bool(driver.visited) is warmed
+        assert (tmp_path / "fast" / "slot-0" / ".warmed").exists() is warmed
+
+    def test_concurrent_drivers_get_separate_data_dirs(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "BROWSER", "chrome")
+        monkeypatch.setattr(settings, "BROWSER_DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(driver_factory.webdriver, "Chrome", FakeDriver)
+        first = DriverFactory.create("fast", record_navigation=False)
+        second = DriverFactory.create("fast", record_navigation=False)
+        assert first.data_dir != second.data_dir
+
+        first.quit()
+        assert not (tmp_path / "fast" / "slot-0" / ".lock").exists()
+        third = DriverFactory.create("fast", record_navigation=False)
+        assert third.data_dir == first.data_dir
+
+    def test_lock_of_dead_process_is_taken_over(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "BROWSER_DATA_DIR", str(tmp_path))
+        (tmp_path / "fast" / "slot-0").mkdir(parents=True)
+        (tmp_path / "fast" / "slot-0" / ".lock").write_text("123456")
+        monkeypatch.setattr(DriverFactory, "_pid_alive", staticmethod(lambda pid: False))
+        assert DriverFactory._acquire_data_dir(PROFILES["fast"]).name == "slot-0"
+
+    def test_slot_released_when_chrome_fails_to_start(self, monkeypatch, tmp_path):
+        def broken(options=None):
+            raise RuntimeError("chrome not found")
+        monkeypatch.setattr(settings, "BROWSER", "chrome")
+        monkeypatch.setattr(settings, "BROWSER_DATA_DIR", str(tmp_path))
+        monkeypatch.setattr(driver_factory.webdriver, "Chrome", broken)
+        with pytest.raises(RuntimeError):
+            DriverFactory.create("fast", record_navigation=False)
+        assert not (tmp_path / "fast" / "slot-0" / ".lock").exists()
+
+    def test_navigation_recording_is_opt_in(self, monkeypatch):
+        monkeypatch.setattr(settings, "BROWSER", "chrome")
+        monkeypatch.setattr(settings, "NAV_PROFILE", False)
+        monkeypatch.setattr(driver_factory.webdriver, "Chrome", FakeDriver)
+        assert isinstance(DriverFactory.create("default"), FakeDriver)
@@ -0,0 +1,83 @@
+import pytest
+from utils.employee_index import EmployeeIndex, api_employee_lookup, db_employee_lookup
+
+pytestmark = pytest.mark.unit
+
+# Shaped like PIMPage.get_employee_rows(): the list shows "First (& Middle) Name"
+ROWS = [
+    {"emp_id": "0042", "first_middle_name": "Linda Jane", "last_name": "Anderson"},
+    {"emp_id": "0043", "first_middle_name": "Peter Mac", "last_name": "Anderson"},
+    {"emp_id": "1001", "first_middle_name": "Lindsay", "last_name": "Cole"},
+]
+
+
+class FakeAPI:
+    def __init__(self, items):
+        self.items = items
+        self.params = None
+
+    def get(self, endpoint, params=None):
+        self.params = params
+        return {"data": self.items}
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        return self.rows
+
+
+@pytest.fixture
+def index():
+    return EmployeeIndex(ROWS)
+
+
+class TestEmployeeIndex:
+    def test_exact_lookup_by_name_and_id(self, index):
+        assert index.find("linda jane  ANDERSON") == [ROWS[0]]
+        assert index.find("0043") == [ROWS[1]]
+        assert index.get(" 1001 ") is ROWS[2]
+        assert not index.contains("Linda")
+
+    def test_names_match_with_and_without_middle_name(self, index):
+        assert index.find("Linda Anderson") == [ROWS[0]]
+        assert index.find("Peter Mac Anderson") == [ROWS[1]]
+        assert index.find("Peter Anderson") == [ROWS[1]]
+        assert not index.contains("Jane Anderson")
+
+    def test_prefix_lookup(self, index):
+        assert index.find("lind", prefix=True) == [ROWS[0], ROWS[2]]
+        assert index.find("004", prefix=True) == [ROWS[0], ROWS[1]]
+        assert not index.contains("zz", prefix=True)
+
+    def test_row_matched_by_name_and_id_is_returned_once(self):
+        row = {"emp_id": "ann", "first_middle_name": "Ann", "last_name": ""}
+        assert EmployeeIndex([row]).find("ann") == [row]
+
+    def test_rows_added_later_are_found_by_prefix(self, index):
+        index.find("x", prefix=True)
+        index.add({"emp_id": "2000", "first_middle_name": "Xavier", "last_name": "Ng"})
+        assert len(index) == 4
+        assert index.contains("xav", prefix=True)
+
+
+def test_api_lookup_uses_reconciliation_field_mapping():
+    api = FakeAPI([{"empId": "0042", "firstName": "Linda Jane", "lastName": "Anderson"}])
+    lookup = api_employee_lookup(api)
+    assert lookup("0042", False)
+    assert lookup("Linda Jane Anderson", False)
+    assert lookup("Linda Anderson", False)
+    assert api.params == {"nameOrId": "Linda Anderson"}
+
+
+def test_db_lookup_escapes_like_wildcards():
+    db = FakeDB([{"?column?": 1}])
+    assert db_employee_lookup(db)("50%_off", True)
+    query, params = db.calls[0]
+    assert "LIKE" in query
+    assert params == ("50\\%\\_off%", "50\\%\\_off%")
+    assert not db_employee_lookup(FakeDB([]))("Nobody", False)
@@ -0,0 +1,109 @@
+import pytest
+from utils.db_utils import DatabaseUtils
+from utils.query_profiler import QueryProfiler
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def profiler():
+    return QueryProfiler(slow_query_ms=100, explain_slow=False, repeat_threshold=3)
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=None):
+        self.connection.executed.append(query)
+
+    def fetchall(self):
+        return [("Seq Scan on employees",)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.executed = []
+        self.rollbacks = 0
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        self.commits += 1
+
+
+class TestFingerprint:
+    def test_literals_and_placeholders_share_a_key(self):
+        a = QueryProfiler.fingerprint("SELECT * FROM hs_hr_employee WHERE emp_number = 42 AND name = 'Ann'")
+        b = QueryProfiler.fingerprint("select *  from hs_hr_employee\n where emp_number = %s and name = %(name)s")
+        assert a == b == "select * from hs_hr_employee where emp_number = ? and name = ?"
+
+    def test_in_lists_collapse(self):
+        assert QueryProfiler.fingerprint("SELECT 1 FROM t WHERE id IN (1, 2, 3)") == \
+            QueryProfiler.fingerprint("SELECT 1 FROM t WHERE id IN (%s)")
+
+    def test_comments_removed(self):
+        assert QueryProfiler.fingerprint("SELECT 1 -- note\n/* hint */ FROM t") == "select ? from t"
+
+
+class TestQueryProfiler:
+    def test_report_ranks_by_total_time(self, profiler):
+        profiler.record("SELECT * FROM a WHERE id = 1", None, 5, 1)
+        profiler.record("SELECT * FROM b", None, 150, 10)
+        profiler.record("SELECT * FROM a WHERE id = 2", None, 5, 1)
+        report = profiler.report()
+        assert report["total_queries"] == 3
+        assert [f["fingerprint"] for f in report["fingerprints"]] == \
+            ["select * from b", "select * from a where id = ?"]
+        assert len(report["slow_queries"]) == 1
+
+    def test_repeated_queries_flag_n_plus_one(self, profiler):
+        for emp_id in (1, 2, 3, 3):
+            profiler.record("SELECT * FROM a WHERE id = %s", (emp_id,), 1, 1)
+        profiler.record("SELECT * FROM b", None, 1, 1)
+        repeated = profiler.repeated_queries()
+        assert repeated == [{
+            "test": profiler.current_test(),
+            "fingerprint": "select * from a where id = ?",
+            "calls": 4,
+            "max_identical_calls": 2
+        }]
+
+    def test_merge_report_combines_workers(self, profiler):
+        worker = QueryProfiler(slow_query_ms=100, explain_slow=False, repeat_threshold=3)
+        for _ in range(3):
+            worker.record("SELECT * FROM a WHERE id = 1", None, 200, 1)
+        profiler.record("SELECT * FROM a WHERE id = 2", None, 10, 1)
+        profiler.merge_report(worker.report())
+        report = profiler.report()
+        assert report["fingerprints"][0]["calls"] == 4
+        assert report["fingerprints"][0]["total_ms"] == 610
+        assert report["fingerprints"][0]["max_ms"] == 200
+        assert len(report["slow_queries"]) == 3
+        assert len(report["repeated_queries"]) == 1
+
+
+class TestExplain:
+    def test_explain_always_rolls_back(self):
+        db = DatabaseUtils.__new__(DatabaseUtils)
+        db.connection = FakeConnection()
+        plan = db.explain("SELECT * FROM employees")
+        assert plan == ["Seq Scan on employees"]
+        assert db.connection.executed == ["EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM employees"]
+        assert (db.connection.rollbacks, db.connection.commits) == (1, 0)
+
+    def test_only_plain_selects_are_explained(self):
+        db = DatabaseUtils.__new__(DatabaseUtils)
+        db.connection = FakeConnection()
+        db.profiler = QueryProfiler(slow_query_ms=0, explain_slow=True, repeat_threshold=10)
+        db._profile_query("WITH moved AS (DELETE FROM t RETURNING *) SELECT * FROM moved", None, 5, 0)
+        db._profile_query("SELECT * FROM t", None, 5, 0)
+        assert db.connection.executed == ["EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM t"]
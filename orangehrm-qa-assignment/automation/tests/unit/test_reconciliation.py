@@ -0,0 +1,144 @@
+import json
+import pytest
+from utils.api_utils import APIUtils
+from utils.reconciliation import (PIM_FIELDS, Reconciler, SortedByKey, api_employees, api_record,
+                                  external_sort, pim_employees, record_digest, synthetic_employees)
+
+pytestmark = pytest.mark.unit
+
+
+def employees(*rows):
+    return [{"emp_id": emp_id, "first_name": first, "last_name": last} for emp_id, first, last in rows]
+
+
+LEFT = employees(("E1", "Ann", "Lee"), ("E2", "Bob", "Ray"), ("E3", "Cy", "Doe"))
+RIGHT = employees(("E2", "Bob", "Roy"), ("E3", "Cy", " Doe "), ("E4", "Di", "Fox"))
+
+
+class FakeAPI:
+    def get_paginated(self, endpoint, page_size=100):
+        yield {"empId": "E2", "firstName": "Bob", "lastName": "Ray", "empNumber": 7}
+
+
+class FakePIMPage:
+    def navigate_to_pim(self):
+        pass
+
+    def search_employee(self, name):
+        pass
+
+    def iter_employee_rows(self):
+        yield {"emp_id": "E1", "first_middle_name": "Ann Marie", "last_name": "Lee", "job_title": "QA"}
+
+
+class PagedAPI(APIUtils):
+    """APIUtils whose GET serves fixed pages instead of making requests"""
+
+    def __init__(self, pages, total=None):
+        self.pages = pages
+        self.total = total
+        self.calls = 0
+
+    def get(self, endpoint, params=None):
+        self.calls += 1
+        page = self.pages(params["offset"], params["limit"])
+        return {"data": page, "meta": {"total": self.total}} if self.total is not None else {"data": page}
+
+
+def read_diff(result):
+    with open(result.diff_path) as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize("mode", ["merge", "hash"])
+def test_modes_agree_on_counts_and_diff(tmp_path, mode):
+    result = Reconciler(output_dir=tmp_path).reconcile(LEFT, RIGHT, mode=mode)
+    assert (result.compared, result.matched, result.mismatched) == (4, 1, 1)
+    assert (result.missing_in_left, result.missing_in_right) == (1, 1)
+    assert not result.consistent
+    diff = sorted(read_diff(result), key=lambda d: d["emp_id"])
+    assert diff == [
+        {"type": "missing_in_right", "emp_id": "E1"},
+        {"type": "mismatched", "emp_id": "E2", "fields": {"last_name": ["Ray", "Roy"]}},
+        {"type": "missing_in_left", "emp_id": "E4"},
+    ]
+
+
+def test_default_mode_sorts_unsorted_sources_on_disk(tmp_path):
+    result = Reconciler(output_dir=tmp_path, sort_chunk_size=2).reconcile(list(reversed(LEFT)), RIGHT)
+    assert result.mode == "merge"
+    assert (result.compared, result.matched, result.mismatched) == (4, 1, 1)
+
+
+def test_merge_rejects_sources_mislabelled_as_sorted():
+    with pytest.raises(ValueError, match="not sorted"):
+        Reconciler(output_dir=None).reconcile(SortedByKey(list(reversed(LEFT))), SortedByKey(RIGHT))
+
+
+@pytest.mark.parametrize("mode", ["merge", "hash"])
+def test_null_and_duplicate_keys_are_reported(tmp_path, mode):
+    left = LEFT + employees((None, "No", "Id"), ("E2", "Bob", "Ray"))
+    right = RIGHT + employees(("  ", "Blank", "Id"))
+    result = Reconciler(output_dir=tmp_path).reconcile(left, right, mode=mode)
+    assert result.invalid_keys == 3
+    assert (result.compared, result.matched) == (4, 1)
+    invalid = sorted((d["side"], d["reason"]) for d in read_diff(result) if d["type"] == "invalid_key")
+    assert invalid == [("left", "duplicate"), ("left", "null"), ("right", "null")]
+
+
+def test_external_sort_orders_across_chunks(tmp_path):
+    records = [{"emp_id": f"E{i:03d}"} for i in range(95, -1, -1)] + [{"emp_id": None}]
+    ordered = list(external_sort(records, chunk_size=10, tmp_dir=tmp_path))
+    assert [r["emp_id"] for r in ordered] == [None] + [f"E{i:03d}" for i in range(96)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_synthetic_drift_and_gaps_are_detected():
+    result = Reconciler(output_dir=None).reconcile(
+        synthetic_employees(10_000), synthetic_employees(10_000, drift_every=1000, skip_every=5000)
+    )
+    assert result.mode == "merge"
+    assert (result.missing_in_left, result.missing_in_right, result.mismatched) == (0, 2, 8)
+
+
+def test_unsorted_synthetic_source_has_the_same_rows():
+    rows = list(synthetic_employees(1000, unsorted=True))
+    assert [r["emp_id"] for r in rows] != sorted(r["emp_id"] for r in rows)
+    assert sorted(rows, key=lambda r: r["emp_id"]) == list(synthetic_employees(1000))
+
+
+def test_pim_rows_compare_without_the_middle_name():
+    pim = list(pim_employees(FakePIMPage()))
+    assert pim == [{"emp_id": "E1", "last_name": "Lee", "first_middle_name": "Ann Marie"}]
+    result = Reconciler(fields=PIM_FIELDS, output_dir=None).reconcile(LEFT[:1], pim)
+    assert result.consistent
+
+
+def test_api_records_use_canonical_fields():
+    assert api_record({"empId": "E9", "firstName": "Al"}) == {"emp_id": "E9", "first_name": "Al"}
+    assert list(api_employees(FakeAPI()))[0]["emp_id"] == "E2"
+
+
+def test_digest_ignores_whitespace_only_differences():
+    assert record_digest(LEFT[2]) == record_digest(RIGHT[1])
+
+
+class TestGetPaginated:
+    def test_follows_pages_until_a_short_page(self):
+        api = PagedAPI(lambda offset, limit: list(range(offset, min(offset + limit, 25))))
+        assert list(api.get_paginated("/employees", page_size=10)) == list(range(25))
+        assert api.calls == 3
+
+    def test_stops_at_reported_total(self):
+        api = PagedAPI(lambda offset, limit: list(range(offset, offset + limit)), total=20)
+        assert list(api.get_paginated("/employees", page_size=10)) == list(range(20))
+        assert api.calls == 2
+
+    def test_stops_when_endpoint_ignores_offset(self):
+        api = PagedAPI(lambda offset, limit: list(range(50)))
+        assert list(api.get_paginated("/employees", page_size=10)) == list(range(50))
+        assert api.calls == 2
+
+    def test_empty_page(self):
+        api = PagedAPI(lambda offset, limit: [] if offset else list(range(10)))
+        assert list(api.get_paginated("/employees", page_size=10)) == list(range(10))
@@ -0,0 +1,105 @@
+import json
+import pytest
+from _pytest.reports import TestReport
+from utils.reporting import ReportBuilder, ResultStore, merge_allure_results
+
+pytestmark = pytest.mark.unit
+
+
+def make_report(nodeid, when, outcome="passed", duration=1.0, longrepr=None, user_properties=()):
+    return TestReport(nodeid, (nodeid, 0, nodeid), {}, outcome, longrepr, when,
+                      duration=duration, start=0, stop=100.0, user_properties=list(user_properties))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / "store", "run1")
+    yield store
+    store.close()
+
+
+def read_records(store):
+    with open(store.path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestResultStore:
+    def test_reused_run_id_starts_over(self, tmp_path):
+        first = ResultStore(tmp_path, "run1")
+        first.append(make_report("t.py::test_a", "call", duration=3.0))
+        first.close()
+        first.done_path.touch()
+
+        second = ResultStore(tmp_path, "run1")
+        second.append(make_report("t.py::test_a", "call", duration=1.0))
+        second.close()
+        assert not second.done_path.exists()
+        assert [r["duration"] for r in read_records(second)] == [1.0]
+
+    def test_every_phase_is_stored(self, store):
+        for when, duration in (("setup", 4.0), ("call", 0.5), ("teardown", 1.0)):
+            store.append(make_report("t.py::test_a", when, duration=duration))
+        records = read_records(store)
+        assert [(r["phase"], r["duration"]) for r in records] == [("setup", 4.0), ("call", 0.5), ("teardown", 1.0)]
+        assert all("message" not in r and "artifacts" not in r for r in records)
+
+    def test_failures_keep_message_and_artifacts(self, store):
+        store.append(make_report("t.py::test_b", "call", "failed", longrepr="AssertionError: boom",
+                                 user_properties=[("artifact", "shots/b.png")]))
+        store.append(make_report("t.py::test_c", "setup", "failed", longrepr="fixture failed"))
+        failed, errored = read_records(store)
+        assert failed["outcome"] == "failed" and "boom" in failed["message"]
+        assert failed["artifacts"] == ["shots/b.png"]
+        assert errored["outcome"] == "error"
+
+
+class TestReportBuilder:
+    def test_folds_phases_by_severity(self, store, tmp_path):
+        store.append(make_report("t.py::test_a", "setup", duration=4.0))
+        store.append(make_report("t.py::test_a", "call", duration=0.5))
+        store.append(make_report("t.py::test_a", "teardown", "failed", duration=1.0, longrepr="quit failed"))
+        store.append(make_report("t.py::test_b", "call", duration=2.0))
+        builder = ReportBuilder([store.path], tmp_path / "report")
+        assert builder.poll() == 4
+        summary = builder.summary()
+        assert summary["total"] == 2
+        assert summary["outcomes"] == {"error": 1, "passed": 1}
+        assert summary["slowest"][0] == {
+            "nodeid": "t.py::test_a", "duration": 5.5, "phases": {"setup": 4.0, "call": 0.5, "teardown": 1.0}
+        }
+        assert builder.tests["run1::t.py::test_a"]["messages"] == ["[teardown] quit failed"]
+
+    def test_poll_reads_only_complete_new_lines(self, store, tmp_path):
+        builder = ReportBuilder([store.path.parent], tmp_path / "report")
+        store.append(make_report("t.py::test_a", "call"))
+        assert builder.poll() == 1
+        with open(store.path, "a") as f:
+            f.write('{"partial": ')
+        assert builder.poll() == 0
+        assert builder.poll() == 0
+        assert len(builder.tests) == 1
+
+    def test_render_writes_summary_and_html(self, store, tmp_path):
+        store.append(make_report("t.py::test_<a>", "call", "failed", longrepr="<boom>"))
+        builder = ReportBuilder([store.path], tmp_path / "report")
+        builder.poll()
+        builder.render()
+        assert json.loads((tmp_path / "report" / "summary.json").read_text())["outcomes"] == {"failed": 1}
+        page = (tmp_path / "report" / "index.html").read_text()
+        assert "t.py::test_&lt;a&gt;" in page and "&lt;boom&gt;" in page
+
+    def test_watch_finishes_with_a_final_pass(self, store, tmp_path):
+        store.append(make_report("t.py::test_a", "call"))
+        done = tmp_path / "run1.done"
+        done.touch()
+        builder = ReportBuilder([store.path], tmp_path / "report")
+        builder.watch(done, interval=0.1)
+        assert builder.summary()["total"] == 1
+
+
+def test_merge_allure_results(tmp_path):
+    for shard in ("a", "b"):
+        (tmp_path / shard).mkdir()
+        (tmp_path / shard / f"{shard}-result.json").write_text("{}")
+    assert merge_allure_results([tmp_path / "a", tmp_path / "b"], tmp_path / "merged") == 2
+    assert sorted(p.name for p in (tmp_path / "merged").iterdir()) == ["a-result.json", "b-result.json"]
@@ -0,0 +1,142 @@
+import random
+from pathlib import Path
+import pytest
+from config.settings import settings
+from utils import scenarios
+from utils.scenarios import BrowserActions, Scenario, ScenarioRunner, ThinkTime, load_scenario
+
+pytestmark = pytest.mark.unit
+
+PIM_MIX = Path(__file__).resolve().parents[2] / "config" / "scenarios" / "pim_mix.yaml"
+
+
+class RecordingActions:
+    """Stand-in action level that records the steps it ran"""
+    calls = []
+
+    def _record(self, ctx):
+        RecordingActions.calls.append(ctx["search_term"])
+
+    login = search = view = add = delete = _record
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self):
+        self.calls = []
+
+    def delete_all_cookies(self):
+        self.calls.append("delete_all_cookies")
+
+    def get(self, url):
+        self.calls.append(url)
+
+
+class FakePIMPage:
+    def __init__(self):
+        self.deleted = []
+
+    def navigate_to_pim(self):
+        pass
+
+    def add_employee(self, first_name, last_name):
+        pass
+
+    def delete_employee(self, name):
+        self.deleted.append(name)
+
+
+class FakeLoginPage:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def login(self, username, password):
+        self.driver.calls.append(f"login:{username}")
+
+
+class TestThinkTime:
+    @pytest.mark.parametrize("spec, expected", [(None, 0), (1.5, 1.5), ({"distribution": "constant", "value": 2}, 2)])
+    def test_from_spec(self, spec, expected):
+        assert ThinkTime.from_spec(spec).sample(random.Random(0)) == expected
+
+    def test_samples_are_never_negative(self):
+        think = ThinkTime("normal", mean=0, stdev=5)
+        assert min(think.sample(random.Random(i)) for i in range(100)) == 0.0
+
+    def test_uniform_stays_in_range(self):
+        think = ThinkTime.from_spec({"distribution": "uniform", "min": 2, "max": 5})
+        assert all(2 <= think.sample(random.Random(i)) <= 5 for i in range(50))
+
+    @pytest.mark.parametrize("spec", [{"distribution": "uniform", "min": 1}, {"distribution": "exponential", "mean": 0},
+                                      {"distribution": "normal", "mean": "1", "stdev": 1}])
+    def test_invalid_spec_fails_on_load(self, spec):
+        with pytest.raises(ValueError, match="Invalid"):
+            ThinkTime.from_spec(spec)
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError, match="Unknown think-time distribution"):
+            ThinkTime("pareto")
+
+
+class TestScenario:
+    def test_load_pim_mix(self):
+        scenario = load_scenario(PIM_MIX)
+        assert [j.name for j in scenario.journeys] == ["search", "search_only", "add", "add_and_delete"]
+        assert sum(j.weight for j in scenario.journeys) == 100
+        add_step = scenario.journeys[2].steps[2]
+        assert add_step.action == "add" and add_step.think_time.distribution == "uniform"
+        assert scenario.journeys[0].steps[0].think_time is None
+        assert scenario.data == "employee" and "search_terms" in scenario.data_options
+
+    @pytest.mark.parametrize("action", ["close", "__init__", "frobnicate"])
+    def test_rejects_non_step_actions(self, action):
+        scenario = Scenario.from_dict({"journeys": [{"name": "j", "steps": ["login", action]}]})
+        with pytest.raises(ValueError, match="Unknown api actions"):
+            ScenarioRunner(scenario)
+
+    def test_rejects_unknown_generator(self):
+        scenario = Scenario.from_dict({"data": "invoices", "journeys": [{"name": "j", "steps": ["login"]}]})
+        with pytest.raises(ValueError, match="Unknown data generator"):
+            ScenarioRunner(scenario)
+
+
+class TestScenarioRunner:
+    def test_run_reports_steps_and_mix(self, monkeypatch):
+        monkeypatch.setitem(scenarios.ACTION_LEVELS, "fake", RecordingActions)
+        RecordingActions.calls = []
+        scenario = Scenario.from_dict({
+            "name": "mix",
+            "data": {"generator": "employee", "search_terms": ["Linda Anderson"]},
+            "journeys": [{"name": "read", "weight": 3, "steps": ["login", "search"]},
+                         {"name": "write", "weight": 1, "steps": ["login", "add"]}]
+        })
+        report = ScenarioRunner(scenario, level="fake", think=False, seed=1).run(users=2, iterations=50)
+        assert report["journeys"] == 100
+        assert report["failed_journeys"] == 0
+        assert report["mix"]["read"]["target"] == 0.75
+        assert report["mix"]["read"]["achieved"] == pytest.approx(0.75, abs=0.1)
+        assert report["steps"]["read.login"]["count"] + report["steps"]["write.login"]["count"] == 100
+        assert set(RecordingActions.calls) == {"Linda Anderson"}
+
+    def test_browser_login_starts_a_fresh_session(self):
+        actions = BrowserActions.__new__(BrowserActions)
+        actions.driver = FakeDriver()
+        actions.login_page = FakeLoginPage(actions.driver)
+        actions.login({})
+        actions.login({})
+        expected = ["delete_all_cookies", settings.login_url, f"login:{settings.ADMIN_USER['username']}"]
+        assert actions.driver.calls == expected * 2
+
+    def test_browser_delete_only_removes_employee_added_in_journey(self):
+        actions = BrowserActions.__new__(BrowserActions)
+        actions.pim_page = FakePIMPage()
+        ctx = {"first_name": "LoadAbc", "last_name": "UserAbc", "search_term": "Linda Anderson"}
+        with pytest.raises(ValueError, match="requires an add step"):
+            actions.delete(ctx)
+        actions.add(ctx)
+        actions.delete(ctx)
+        with pytest.raises(ValueError):
+            actions.delete(ctx)
+        assert actions.pim_page.deleted == ["LoadAbc UserAbc"]
@@ -1,7 +1,7 @@
 import requests
 import logging
 import json
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Iterator, Union
 from pathlib import Path
 from config.settings import settings
 from urllib.parse import urljoin
@@ -69,6 +69,28 @@ class APIUtils:
         """GET request with JSON response"""
         return self._make_request("GET", endpoint, params=params).json()
 
+    def get_paginated(self, endpoint: str, params: Optional[Dict] = None,
+                      page_size: int = 100, data_key: str = "data") -> Iterator[Dict]:
+        """Yield items from a limit/offset paginated GET endpoint page by page.
+
+        Stops on a short or empty page, once the reported meta.total is reached, or when a
+        page starts with the same item as the previous one (the endpoint ignores offset).
+        """
+        offset = 0
+        previous_first = None
+        while True:
+            page_params = dict(params or {}, limit=page_size, offset=offset)
+            response = self.get(endpoint, params=page_params)
+            items = response.get(data_key, [])
+            if not items or items[0] == previous_first:
+                return
+            yield from items
+            offset += len(items)
+            total = (response.get("meta") or {}).get("total")
+            if len(items) < page_size or (total is not None and offset >= total):
+                return
+            previous_first = items[0]
+
     def post(self, endpoint: str, data: Optional[Union[Dict, str]] = None) -> Dict:
         """POST request with JSON response"""
         return self._make_request("POST", endpoint, data=data).json()
@@ -0,0 +1,292 @@
+import os
+import json
+import math
+import bisect
+import fnmatch
+import time
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = Path("results/performance")
+LIVE_DIR = RESULTS_DIR / "live"
+# Files written by PerformanceUtils.save_results; other reports in RESULTS_DIR carry no samples
+BENCHMARK_PATTERN = "benchmark_*.json"
+STATIC_PAGE = Path(__file__).with_name("dashboard.html")
+
+
+class LiveRecorder:
+    """Appends samples of an in-progress run to results/performance/live/<name>.log.
+
+    Each line is "<epoch seconds> <latency seconds>". Writes are buffered and flushed at most
+    once per flush_interval so recording stays cheap on the test hot path. The first line is a
+    "#" header naming the run, which lets readers tell a restarted run from appended samples.
+    """
+
+    def __init__(self, name: str, live_dir: Path = LIVE_DIR, flush_interval: float = 1.0):
+        live_dir.mkdir(parents=True, exist_ok=True)
+        self.path = live_dir / f"{name}.log"
+        self.flush_interval = flush_interval
+        self._file = open(self.path, "w")
+        self._last_flush = time.time()
+        self._file.write(f"# {name} started {self._last_flush:.6f} pid {os.getpid()}\n")
+        self._file.flush()
+
+    def record(self, latency: float):
+        now = time.time()
+        self._file.write(f"{now:.3f} {latency:.6f}\n")
+        if now - self._last_flush >= self.flush_interval:
+            self._file.flush()
+            self._last_flush = now
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def decimate(values: List[float], max_points: int = 2000) -> List[Tuple[int, float]]:
+    """Min/max decimation: keep each bucket's extremes in order so spikes survive downsampling"""
+    if max_points < 2:
+        raise ValueError(f"max_points must be at least 2, got {max_points}")
+    if len(values) <= max_points:
+        return list(enumerate(values))
+    buckets = max_points // 2
+    size = len(values) / buckets
+    points = []
+    for b in range(buckets):
+        start, end = int(b * size), int((b + 1) * size)
+        chunk = values[start:end]
+        lo = min(range(len(chunk)), key=chunk.__getitem__)
+        hi = max(range(len(chunk)), key=chunk.__getitem__)
+        for i in sorted({lo, hi}):
+            points.append((start + i, chunk[i]))
+    return points
+
+
+def _histogram_of_sorted(ordered: List[float], bins: int) -> Dict[str, List[float]]:
+    if not ordered:
+        return {"edges": [], "counts": []}
+    lo, hi = ordered[0], ordered[-1]
+    width = (hi - lo) / bins or 1.0
+    edges = [lo + i * width for i in range(bins + 1)]
+    # Bin boundaries are positions in the sorted samples, found by bisection
+    bounds = [0] + [bisect.bisect_left(ordered, edge) for edge in edges[1:-1]] + [len(ordered)]
+    return {"edges": edges, "counts": [bounds[i + 1] - bounds[i] for i in range(bins)]}
+
+
+def _summary_of_sorted(ordered: List[float], total: float) -> Dict[str, float]:
+    if not ordered:
+        return {}
+
+    def percentile(p):
+        k = (len(ordered) - 1) * p / 100
+        f, c = math.floor(k), math.ceil(k)
+        return ordered[f] + (ordered[c] - ordered[f]) * (k - f)
+
+    return {
+        "count": len(ordered),
+        "mean": total / len(ordered),
+        "median": percentile(50),
+        "p90": percentile(90),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": ordered[-1]
+    }
+
+
+def histogram(values: List[float], bins: int = 30) -> Dict[str, List[float]]:
+    return _histogram_of_sorted(sorted(values), bins)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return _summary_of_sorted(sorted(values), sum(values))
+
+
+class SampleSeries:
+    """Samples in arrival order plus a sorted copy kept up to date as samples arrive.
+
+    Summaries and histograms read the sorted copy, so polling a growing live run never
+    re-sorts or copies the samples it has already seen.
+    """
+
+    def __init__(self, values: Iterable[float] = ()):
+        self.values: List[float] = list(values)
+        self._ordered = sorted(self.values)
+        self._total = sum(self.values)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def extend(self, new: List[float]):
+        if not new:
+            return
+        with self._lock:
+            self.values.extend(new)
+            self._total += sum(new)
+            # Two sorted runs: timsort merges them in linear time rather than sorting from scratch
+            self._ordered.extend(sorted(new))
+            self._ordered.sort()
+
+    def summary(self) -> Dict[str, float]:
+        with self._lock:
+            return _summary_of_sorted(self._ordered, self._total)
+
+    def histogram(self, bins: int = 30) -> Dict[str, List[float]]:
+        with self._lock:
+            return _histogram_of_sorted(self._ordered, bins)
+
+
+def series_of(result: Dict[str, Any]) -> List[float]:
+    """Samples of a stored result: raw_times from benchmark(), timings from load_test()"""
+    return result.get("raw_times") or result.get("timings") or []
+
+
+class _LiveLog:
+    """Read position in a live sample log and the samples parsed so far"""
+
+    def __init__(self, inode: int, header: bytes):
+        self.inode = inode
+        self.header = header
+        self.offset = 0
+        self.series = SampleSeries()
+
+
+class ResultsRepository:
+    """Reads stored benchmark results and live sample logs, caching parsed files by mtime/offset"""
+
+    def __init__(self, results_dir: Path = RESULTS_DIR):
+        self.results_dir = results_dir
+        self.live_dir = results_dir / "live"
+        self._lock = threading.Lock()
+        self._stored: Dict[Path, Tuple[float, SampleSeries]] = {}
+        self._live: Dict[Path, _LiveLog] = {}
+
+    def list(self) -> Dict[str, List[str]]:
+        stored = sorted((p.name for p in self.results_dir.glob(BENCHMARK_PATTERN)), reverse=True)
+        live = sorted(p.stem for p in self.live_dir.glob("*.log")) if self.live_dir.exists() else []
+        return {"stored": stored, "live": live}
+
+    def _safe(self, directory: Path, name: str) -> Path:
+        path = (directory / name).resolve()
+        if path.parent != directory.resolve():
+            raise ValueError(f"Invalid result name: {name}")
+        return path
+
+    def stored_series(self, name: str) -> SampleSeries:
+        if not fnmatch.fnmatch(name, BENCHMARK_PATTERN):
+            raise ValueError(f"Not a benchmark result: {name}")
+        path = self._safe(self.results_dir, name)
+        mtime = path.stat().st_mtime
+        with self._lock:
+            cached = self._stored.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        with open(path) as f:
+            series = SampleSeries(series_of(json.load(f)))
+        with self._lock:
+            self._stored[path] = (mtime, series)
+        return series
+
+    def live_series(self, name: str) -> SampleSeries:
+        """Parse only the bytes appended since the previous request.
+
+        A recorder restarting under the same name rewrites the file from the start, so the
+        cached samples are dropped when the file is replaced, shrinks, or its header line changes.
+        """
+        path = self._safe(self.live_dir, f"{name}.log")
+        with self._lock, open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            header = f.readline(4096)
+            header = header if header.endswith(b"\n") else b""
+            log = self._live.get(path)
+            if log is None or log.inode != stat.st_ino or log.header != header or stat.st_size < log.offset:
+                log = self._live[path] = _LiveLog(stat.st_ino, header)
+            f.seek(log.offset)
+            chunk = f.read()
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            log.series.extend([float(line.split()[1]) for line in complete.splitlines()
+                               if line.strip() and not line.startswith(b"#")])
+            log.offset += len(complete)
+        return log.series
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    repository: ResultsRepository = None
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, payload: Any, status: int = 200):
+        self._send(json.dumps(payload).encode(), "application/json", status)
+
+    def _series(self, query: Dict[str, List[str]], key: str) -> SampleSeries:
+        name = query[key][0]
+        if query.get("live", ["0"])[0] == "1":
+            return self.repository.live_series(name)
+        return self.repository.stored_series(name)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path == "/":
+                self._send(STATIC_PAGE.read_bytes(), "text/html; charset=utf-8")
+            elif url.path == "/api/results":
+                self._json(self.repository.list())
+            elif url.path == "/api/series":
+                points = int(query.get("points", ["2000"])[0])
+                if points < 2:
+                    raise ValueError("points must be at least 2")
+                series = self._series(query, "name")
+                self._json({"points": decimate(series.values, points), "histogram": series.histogram(),
+                            "summary": series.summary()})
+            elif url.path == "/api/compare":
+                baseline = self.repository.stored_series(query["baseline"][0])
+                current = self._series(query, "current")
+                self._json({"baseline": baseline.summary(), "current": current.summary()})
+            else:
+                self._json({"error": "not found"}, 404)
+        except (KeyError, ValueError, FileNotFoundError) as e:
+            self._json({"error": str(e)}, 400)
+
+
+def serve(port: int = 8050, results_dir: Path = RESULTS_DIR, host: str = "127.0.0.1"):
+    """Serve the dashboard until interrupted"""
+    DashboardHandler.repository = ResultsRepository(results_dir)
+    server = ThreadingHTTPServer((host, port), DashboardHandler)
+    logger.info(f"Performance dashboard at http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local performance dashboard")
+    parser.add_argument("--port", type=int, default=8050)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--results-dir", type=Path, default=RESULTS_DIR)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    serve(args.port, args.results_dir, args.host)
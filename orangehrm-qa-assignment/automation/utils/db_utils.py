@@ -1,16 +1,20 @@
 import psycopg2
 import logging
-from typing import Dict, List, Optional, Union
+import time
+import uuid
+from typing import Dict, Iterator, List, Optional, Union
 from pathlib import Path
 from config.settings import settings
 from contextlib import contextmanager
+from utils.query_profiler import QueryProfiler, query_profiler
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 class DatabaseUtils:
-    def __init__(self):
+    def __init__(self, profiler: Optional[QueryProfiler] = None):
         self.connection = None
+        self.profiler = profiler or (query_profiler if settings.DB_PROFILE else None)
         self._connect()
 
     def _connect(self):
@@ -52,15 +56,72 @@ class DatabaseUtils:
         """Execute query with optional DataFrame return"""
         try:
             with self.get_cursor() as cursor:
+                start_time = time.perf_counter()
                 cursor.execute(query, params)
                 if cursor.description:
                     columns = [desc[0] for desc in cursor.description]
                     data = [dict(zip(columns, row)) for row in cursor.fetchall()]
-                    return pd.DataFrame(data) if return_df else data
-                return pd.DataFrame() if return_df else []
+                    rows = len(data)
+                else:
+                    data = []
+                    rows = max(cursor.rowcount, 0)
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
         except Exception as e:
             logger.error(f"Query execution failed: {str(e)}")
             raise
+        if self.profiler:
+            self._profile_query(query, params, elapsed_ms, rows)
+        if return_df:
+            return pd.DataFrame(data)
+        return data
+
+    def stream_query(self, query: str, params: Optional[tuple] = None, batch_size: int = 5000) -> Iterator[Dict]:
+        """Yield rows one at a time through a server-side cursor to keep memory bounded"""
+        cursor = self.connection.cursor(name=f"stream_{uuid.uuid4().hex}")
+        cursor.itersize = batch_size
+        rows = 0
+        start_time = time.perf_counter()
+        try:
+            cursor.execute(query, params)
+            columns = None
+            for row in cursor:
+                if columns is None:
+                    columns = [desc[0] for desc in cursor.description]
+                rows += 1
+                yield dict(zip(columns, row))
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f"Streaming query failed: {str(e)}")
+            raise
+        finally:
+            cursor.close()
+        if self.profiler:
+            self.profiler.record(query, params, (time.perf_counter() - start_time) * 1000, rows)
+
+    def _profile_query(self, query: str, params: Optional[tuple], elapsed_ms: float, rows: int):
+        """Hand timing to the profiler, capturing a plan for slow plain SELECTs"""
+        explain = None
+        if (self.profiler.explain_slow and self.profiler.is_slow(elapsed_ms)
+                and query.lstrip().lower().startswith("select")):
+            explain = self.explain(query, params)
+        self.profiler.record(query, params, elapsed_ms, rows, explain=explain)
+
+    def explain(self, query: str, params: Optional[tuple] = None) -> Optional[List[str]]:
+        """Return EXPLAIN (ANALYZE, BUFFERS) output.
+
+        ANALYZE re-executes the statement, so it runs in a transaction that is always rolled back.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.warning(f"EXPLAIN failed: {str(e)}")
+            return None
+        finally:
+            cursor.close()
+            self.connection.rollback()
 
     def execute_script(self, script_path: Path):
         """Execute SQL script with transaction handling"""
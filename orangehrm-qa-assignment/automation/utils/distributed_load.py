@@ -0,0 +1,464 @@
+import json
+import math
+import time
+import socket
+import logging
+import argparse
+import importlib
+import selectors
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets grow by 2%, so merged percentiles are accurate to ~2%
+_BUCKET_BASE = 1.02
+_MIN_LATENCY_MS = 0.01
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram that can be merged exactly across processes"""
+
+    def __init__(self, counts: Optional[Dict[int, int]] = None, total_ms: float = 0.0):
+        self.counts: Dict[int, int] = dict(counts or {})
+        self.total_ms = total_ms
+
+    def record(self, latency_ms: float):
+        bucket = int(math.log(max(latency_ms, _MIN_LATENCY_MS) / _MIN_LATENCY_MS, _BUCKET_BASE))
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total_ms += latency_ms
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.total_ms += other.total_ms
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def mean(self) -> float:
+        count = self.count
+        return self.total_ms / count if count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile, in milliseconds"""
+        total = self.count
+        if not total:
+            return 0.0
+        threshold = total * p / 100
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= threshold:
+                return _MIN_LATENCY_MS * _BUCKET_BASE ** (bucket + 1)
+        return 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"counts": {str(b): c for b, c in self.counts.items()}, "total_ms": self.total_ms}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencyHistogram":
+        return cls({int(b): c for b, c in data["counts"].items()}, data["total_ms"])
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]):
+    sock.sendall((json.dumps(message) + "\n").encode())
+
+
+def _target_path(target: Union[str, Callable]) -> str:
+    """Workers may run on other hosts, so targets travel as 'module:function' import paths"""
+    if isinstance(target, str):
+        return target
+    if "<" in target.__qualname__:
+        raise ValueError(f"Load target must be an importable module-level function, got {target.__qualname__}")
+    return f"{target.__module__}:{target.__qualname__}"
+
+
+def _resolve_target(path: str) -> Callable:
+    module_name, _, attr = path.partition(":")
+    obj = importlib.import_module(module_name)
+    for part in attr.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+
+class LoadWorker:
+    """Runs a share of the target rate and streams interval summaries to the coordinator.
+
+    Latency is measured from each call's scheduled time, so time spent waiting for a free
+    thread counts against the target. At most `concurrency + queue_depth` calls are pending;
+    calls that come due while the queue is full are counted as dropped instead of queued.
+    Pacing and latency use the worker's monotonic clock and the coordinator only sends a
+    relative start delay, so clock offsets between hosts don't skew the results.
+    """
+
+    def __init__(self, coordinator: str, worker_id: Optional[str] = None, concurrency: int = 16,
+                 queue_depth: Optional[int] = None):
+        host, _, port = coordinator.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        self.worker_id = worker_id or f"{socket.gethostname()}-{multiprocessing.current_process().pid}"
+        self.concurrency = concurrency
+        self.queue_depth = concurrency if queue_depth is None else queue_depth
+        self._lock = threading.Lock()
+        self._pending: Set[Future] = set()
+        self._histogram = LatencyHistogram()
+        self._errors = 0
+        self._dropped = 0
+        self._cancelled = 0
+
+    def _call(self, func: Callable, due: float):
+        try:
+            func()
+            failed = False
+        except Exception as e:
+            logger.debug(f"Load target failed: {str(e)}")
+            failed = True
+        elapsed_ms = (time.monotonic() - due) * 1000
+        with self._lock:
+            self._histogram.record(elapsed_ms)
+            if failed:
+                self._errors += 1
+
+    def _submit(self, executor: ThreadPoolExecutor, func: Callable, due: float):
+        with self._lock:
+            if len(self._pending) >= self.concurrency + self.queue_depth:
+                self._dropped += 1
+                return
+            future = executor.submit(self._call, func, due)
+            self._pending.add(future)
+        # Runs immediately if the call already finished
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future: Future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _drain(self) -> Dict[str, Any]:
+        with self._lock:
+            histogram, errors, dropped, cancelled = self._histogram, self._errors, self._dropped, self._cancelled
+            self._histogram, self._errors, self._dropped, self._cancelled = LatencyHistogram(), 0, 0, 0
+        return {"histogram": histogram.to_dict(), "errors": errors, "dropped": dropped, "cancelled": cancelled}
+
+    def _summary(self, sock: socket.socket):
+        _send(sock, {"type": "summary", "worker": self.worker_id, **self._drain()})
+
+    def run(self):
+        """Connect, wait for the synchronized start, run paced load and report until done"""
+        with socket.create_connection(self.address) as sock:
+            _send(sock, {"type": "hello", "worker": self.worker_id})
+            config = json.loads(sock.makefile().readline())
+            func = _resolve_target(config["target"])
+            rate = config["rate"]
+            interval = config["report_interval"]
+            start_at = time.monotonic() + config["start_in"]
+            end_at = start_at + config["duration"]
+            time.sleep(max(0, start_at - time.monotonic()))
+
+            next_report = time.monotonic() + interval
+            issued = 0
+            executor = ThreadPoolExecutor(max_workers=self.concurrency)
+            while True:
+                now = time.monotonic()
+                if now >= end_at:
+                    break
+                if now >= next_report:
+                    self._summary(sock)
+                    next_report += interval
+                # Open-loop pacing: call i is due at start_at + i / rate regardless of latency
+                due = start_at + issued / rate
+                if due <= now:
+                    self._submit(executor, func, due)
+                    issued += 1
+                else:
+                    time.sleep(max(0, min(due, next_report, end_at) - now))
+
+            # Calls still queued at the end would only measure the backlog; cancel and count them
+            with self._lock:
+                pending = list(self._pending)
+            cancelled = sum(1 for future in pending if future.cancel())
+            with self._lock:
+                self._cancelled += cancelled
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Keep reporting while running calls finish so the coordinator sees the worker is alive
+            drain_deadline = end_at + config["drain_timeout"]
+            while True:
+                with self._lock:
+                    pending = list(self._pending)
+                now = time.monotonic()
+                if not pending or now >= drain_deadline:
+                    break
+                if now >= next_report:
+                    self._summary(sock)
+                    next_report += interval
+                wait(pending, timeout=max(0, min(next_report, drain_deadline) - now), return_when=FIRST_COMPLETED)
+            if pending:
+                logger.warning(f"{len(pending)} calls still running {config['drain_timeout']}s after the end")
+            self._summary(sock)
+            _send(sock, {"type": "done", "worker": self.worker_id, "issued": issued, "unfinished": len(pending)})
+
+
+def _run_local_worker(coordinator: str, worker_id: str, concurrency: int, queue_depth: Optional[int]):
+    LoadWorker(coordinator, worker_id, concurrency, queue_depth).run()
+
+
+class LoadCoordinator:
+    """Spawns or accepts load workers, starts them together and aggregates their results live.
+
+    Worker summaries are interval deltas sent as whole JSON lines, so a worker that
+    dies mid-run only loses its unsent interval; the report keeps every summary that
+    arrived and lists the worker as lost. Workers send a summary every interval, so only
+    one that disconnects or stays silent for `silence_timeout` is treated as lost.
+    Connections that don't send a valid hello within `handshake_timeout` are closed and
+    not counted as workers.
+    """
+
+    def __init__(self, target: Union[str, Callable], workers: int = 4, rate: float = 100.0,
+                 duration: int = 60, remote_workers: int = 0, host: str = "127.0.0.1", port: int = 0,
+                 concurrency: int = 16, queue_depth: Optional[int] = None, report_interval: float = 1.0,
+                 window: float = 5.0, start_delay: float = 2.0, connect_timeout: float = 60.0,
+                 drain_timeout: float = 30.0, silence_timeout: Optional[float] = None,
+                 handshake_timeout: float = 10.0):
+        self.target = _target_path(target)
+        self.local_workers = workers
+        self.remote_workers = remote_workers
+        self.rate = rate
+        self.duration = duration
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self.report_interval = report_interval
+        self.window = window
+        self.start_delay = start_delay
+        self.connect_timeout = connect_timeout
+        self.drain_timeout = drain_timeout
+        self.silence_timeout = silence_timeout or max(10 * report_interval, 30)
+        self.handshake_timeout = handshake_timeout
+
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.workers: Dict[str, Dict[str, Any]] = {}
+        self._recent = deque()
+
+    @property
+    def expected_workers(self) -> int:
+        return self.local_workers + self.remote_workers
+
+    def _read_hello(self, conn: socket.socket) -> Optional[str]:
+        """Worker id from the connection's hello message, or None if it isn't a valid worker"""
+        conn.settimeout(self.handshake_timeout)
+        try:
+            with conn.makefile("rb") as f:
+                hello = json.loads(f.readline(65536))
+        except (OSError, ValueError):
+            return None
+        finally:
+            conn.settimeout(None)
+        if not isinstance(hello, dict) or hello.get("type") != "hello":
+            return None
+        worker_id = hello.get("worker")
+        if not isinstance(worker_id, str) or not worker_id or worker_id in self.workers:
+            return None
+        return worker_id
+
+    def _accept_workers(self, server: socket.socket) -> Dict[socket.socket, str]:
+        connections = {}
+        deadline = time.monotonic() + self.connect_timeout
+        while len(connections) < self.expected_workers:
+            server.settimeout(max(deadline - time.monotonic(), 0.001))
+            try:
+                conn, peer = server.accept()
+            except socket.timeout:
+                for conn in connections:
+                    conn.close()
+                raise TimeoutError(f"Only {len(connections)}/{self.expected_workers} workers connected")
+            worker_id = self._read_hello(conn)
+            if worker_id is None:
+                logger.warning(f"Ignoring connection from {peer[0]}:{peer[1]}: no valid hello")
+                conn.close()
+                continue
+            connections[conn] = worker_id
+            self.workers[worker_id] = {"status": "running", "requests": 0, "errors": 0,
+                                       "dropped": 0, "cancelled": 0}
+            logger.info(f"Worker {worker_id} connected ({len(connections)}/{self.expected_workers})")
+        return connections
+
+    def _handle(self, message: Dict[str, Any]):
+        worker = self.workers[message["worker"]]
+        if message["type"] == "done":
+            worker["status"] = "completed"
+            worker["issued"] = message["issued"]
+            worker["unfinished"] = message["unfinished"]
+            return
+        histogram = LatencyHistogram.from_dict(message["histogram"])
+        self.histogram.merge(histogram)
+        self.errors += message["errors"]
+        self.dropped += message["dropped"]
+        self.cancelled += message["cancelled"]
+        worker["requests"] += histogram.count
+        worker["errors"] += message["errors"]
+        worker["dropped"] += message["dropped"]
+        worker["cancelled"] += message["cancelled"]
+        self._recent.append((time.time(), message["worker"], histogram, message["errors"], message["dropped"]))
+
+    def _print_rolling(self):
+        cutoff = time.time() - self.window
+        while self._recent and self._recent[0][0] < cutoff:
+            self._recent.popleft()
+        window = LatencyHistogram()
+        errors = dropped = 0
+        for _, _, histogram, interval_errors, interval_dropped in self._recent:
+            window.merge(histogram)
+            errors += interval_errors
+            dropped += interval_dropped
+        # Each summary covers one report interval of one worker
+        reporting = len({worker for _, worker, *_ in self._recent}) or 1
+        span = max(len(self._recent) / reporting, 1) * self.report_interval
+        running = sum(1 for w in self.workers.values() if w["status"] == "running")
+        logger.info(
+            f"[{running}/{self.expected_workers} workers] {window.count / span:.1f} req/s, "
+            f"p50={window.percentile(50):.1f}ms p95={window.percentile(95):.1f}ms "
+            f"p99={window.percentile(99):.1f}ms errors={errors} dropped={dropped}"
+        )
+
+    def _close(self, selector: selectors.BaseSelector, conn: socket.socket, worker_id: str, reason: str):
+        selector.unregister(conn)
+        conn.close()
+        if self.workers[worker_id]["status"] != "completed":
+            self.workers[worker_id]["status"] = "lost"
+            logger.warning(f"Worker {worker_id} {reason}")
+
+    def run(self) -> Dict[str, Any]:
+        """Run the distributed load test and return the aggregated report"""
+        context = multiprocessing.get_context("spawn")
+        processes = []
+        with socket.create_server((self.host, self.port)) as server:
+            address = "{}:{}".format(*server.getsockname()[:2])
+            logger.info(f"Coordinator listening on {address}, waiting for {self.expected_workers} workers")
+            for i in range(self.local_workers):
+                process = context.Process(target=_run_local_worker,
+                                          args=(address, f"local-{i}", self.concurrency, self.queue_depth),
+                                          daemon=True)
+                process.start()
+                processes.append(process)
+            connections = self._accept_workers(server)
+
+        start_at = time.time() + self.start_delay
+        config = {
+            "target": self.target,
+            "rate": self.rate / self.expected_workers,
+            "duration": self.duration,
+            "report_interval": self.report_interval,
+            "start_in": self.start_delay,
+            "drain_timeout": self.drain_timeout
+        }
+        selector = selectors.DefaultSelector()
+        buffers = {}
+        for conn, worker_id in connections.items():
+            _send(conn, config)
+            conn.setblocking(False)
+            selector.register(conn, selectors.EVENT_READ, worker_id)
+            buffers[conn] = b""
+
+        last_seen = {worker_id: start_at for worker_id in connections.values()}
+        next_print = start_at + self.report_interval
+        while selector.get_map():
+            for key, _ in selector.select(timeout=self.report_interval / 4):
+                conn, worker_id = key.fileobj, key.data
+                try:
+                    chunk = conn.recv(65536)
+                except OSError:
+                    chunk = b""
+                if not chunk:
+                    self._close(selector, conn, worker_id, "disconnected before finishing")
+                    continue
+                last_seen[worker_id] = time.time()
+                *lines, buffers[conn] = (buffers[conn] + chunk).split(b"\n")
+                for line in lines:
+                    self._handle(json.loads(line))
+            now = time.time()
+            for key in list(selector.get_map().values()):
+                if now - last_seen[key.data] > self.silence_timeout:
+                    self._close(selector, key.fileobj, key.data, f"sent nothing for {self.silence_timeout:.0f}s")
+            if now >= next_print:
+                self._print_rolling()
+                next_print += self.report_interval
+
+        selector.close()
+        for process in processes:
+            process.join(timeout=5)
+        return self.report(start_at)
+
+    def report(self, start_at: float) -> Dict[str, Any]:
+        elapsed = min(time.time() - start_at, self.duration) or self.duration
+        return {
+            "duration": self.duration,
+            "target_rate": self.rate,
+            "workers": self.workers,
+            "lost_workers": [w for w, info in self.workers.items() if info["status"] == "lost"],
+            "total_requests": self.histogram.count,
+            "errors": self.errors,
+            # Calls that came due while a worker's queue was full, or were still queued at the end
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+            "throughput": self.histogram.count / elapsed,
+            "mean_ms": self.histogram.mean,
+            "p50_ms": self.histogram.percentile(50),
+            "p90_ms": self.histogram.percentile(90),
+            "p95_ms": self.histogram.percentile(95),
+            "p99_ms": self.histogram.percentile(99)
+        }
+
+    @staticmethod
+    def save_report(report: Dict[str, Any], output_dir: Path = Path("results/performance")) -> Path:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = output_dir / f"distributed_load_{timestamp}.json"
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed load runner")
+    subparsers = parser.add_subparsers(dest="role", required=True)
+
+    coordinate = subparsers.add_parser("coordinate", help="spawn local workers and aggregate results")
+    coordinate.add_argument("--target", required=True, help="load function as module:function")
+    coordinate.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    coordinate.add_argument("--remote-workers", type=int, default=0)
+    coordinate.add_argument("--rate", type=float, default=100.0, help="total requests per second")
+    coordinate.add_argument("--duration", type=int, default=60)
+    coordinate.add_argument("--host", default="127.0.0.1")
+    coordinate.add_argument("--port", type=int, default=0)
+    coordinate.add_argument("--concurrency", type=int, default=16)
+    coordinate.add_argument("--queue-depth", type=int, help="queued calls per worker beyond concurrency "
+                                                            "before new ones are dropped (default: concurrency)")
+
+    worker = subparsers.add_parser("worker", help="join a coordinator running on another host")
+    worker.add_argument("--connect", required=True, help="coordinator host:port")
+    worker.add_argument("--concurrency", type=int, default=16)
+    worker.add_argument("--queue-depth", type=int)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.role == "worker":
+        LoadWorker(args.connect, concurrency=args.concurrency, queue_depth=args.queue_depth).run()
+    else:
+        coordinator = LoadCoordinator(
+            args.target, workers=args.workers, rate=args.rate, duration=args.duration,
+            remote_workers=args.remote_workers, host=args.host, port=args.port,
+            concurrency=args.concurrency, queue_depth=args.queue_depth
+        )
+        report = coordinator.run()
+        print(json.dumps(report, indent=2))
+        print(f"Report saved: {LoadCoordinator.save_report(report)}")
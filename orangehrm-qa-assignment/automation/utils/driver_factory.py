@@ -0,0 +1,297 @@
+import os
+import json
+import time
+import logging
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from selenium import webdriver
+from selenium.webdriver.support.events import AbstractEventListener, EventFiringWebDriver
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Patterns use the wildcard syntax of CDP Network.setBlockedURLs
+ASSET_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico"]
+THIRD_PARTY_PATTERNS = ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*fonts.googleapis.com*",
+                        "*fonts.gstatic.com*", "*hotjar.com*"]
+
+
+@dataclass
+class BrowserProfile:
+    name: str
+    blocked_urls: List[str] = field(default_factory=list)
+    page_load_strategy: str = "normal"
+    persistent: bool = False
+    extra_arguments: List[str] = field(default_factory=list)
+
+
+PROFILES: Dict[str, BrowserProfile] = {
+    "default": BrowserProfile("default"),
+    "fast": BrowserProfile(
+        "fast",
+        blocked_urls=ASSET_PATTERNS + THIRD_PARTY_PATTERNS,
+        page_load_strategy="eager",
+        persistent=True,
+        extra_arguments=["--disable-extensions", "--disable-background-networking", "--no-first-run"]
+    ),
+    "no-third-party": BrowserProfile(
+        "no-third-party",
+        blocked_urls=THIRD_PARTY_PATTERNS,
+        persistent=True
+    ),
+}
+
+
+class NavigationTimer(AbstractEventListener):
+    """Records wall-clock time of every driver.get, grouped by URL path"""
+
+    def __init__(self, profile: str):
+        self.profile = profile
+        self._started = None
+
+    def before_navigate_to(self, url, driver):
+        self._started = time.perf_counter()
+
+    def after_navigate_to(self, url, driver):
+        if self._started is None:
+            return
+        elapsed_ms = (time.perf_counter() - self._started) * 1000
+        self._started = None
+        navigation_log.record(self.profile, url, elapsed_ms)
+
+
+class NavigationLog:
+    """Per-run navigation timings and their comparison against the default-profile baseline"""
+
+    def __init__(self, baseline_path: Path = Path("results/performance/navigation_baseline.json")):
+        self.baseline_path = baseline_path
+        self.timings: Dict[str, Dict[str, List[float]]] = {}
+
+    def record(self, profile: str, url: str, elapsed_ms: float):
+        path = urlsplit(url).path or "/"
+        self.timings.setdefault(profile, {}).setdefault(path, []).append(elapsed_ms)
+
+    def merge(self, timings: Dict[str, Dict[str, List[float]]]):
+        """Add raw timings recorded by another process (e.g. an xdist worker)"""
+        for profile, paths in timings.items():
+            for path, times in paths.items():
+                self.timings.setdefault(profile, {}).setdefault(path, []).extend(times)
+
+    def save_timings(self, path: Path) -> Optional[Path]:
+        """Write raw timings for the controlling process to merge; the baseline is left untouched"""
+        if not self.timings:
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.timings, f)
+        return path
+
+    def _load_baseline(self) -> Dict[str, float]:
+        if not self.baseline_path.exists():
+            return {}
+        with open(self.baseline_path) as f:
+            return json.load(f)
+
+    def report(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Mean navigation time per profile and path, with time saved versus the baseline"""
+        baseline = self._load_baseline()
+        baseline.update({
+            path: statistics.mean(times)
+            for path, times in self.timings.get("default", {}).items()
+        })
+        report = {}
+        for profile, paths in self.timings.items():
+            report[profile] = {}
+            for path, times in paths.items():
+                mean_ms = statistics.mean(times)
+                entry = {"navigations": len(times), "mean_ms": mean_ms}
+                if profile != "default" and path in baseline:
+                    entry["baseline_ms"] = baseline[path]
+                    entry["saved_ms"] = baseline[path] - mean_ms
+                report[profile][path] = entry
+        return report
+
+    def save_report(self, output_dir: Path = Path("results/performance")) -> Optional[Path]:
+        """Write the navigation report and refresh the baseline from default-profile runs.
+
+        Only one process per run may call this, since it rewrites the shared baseline file.
+        """
+        if not self.timings:
+            return None
+        output_dir.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        for profile, paths in report.items():
+            for path, entry in paths.items():
+                if "saved_ms" in entry:
+                    logger.info(f"[{profile}] {path}: {entry['mean_ms']:.0f}ms ({entry['saved_ms']:+.0f}ms saved)")
+        if "default" in self.timings:
+            baseline = self._load_baseline()
+            baseline.update({path: entry["mean_ms"] for path, entry in report["default"].items()})
+            self.baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.baseline_path, 'w') as f:
+                json.dump(baseline, f, indent=2)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = output_dir / f"navigation_{timestamp}.json"
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report_path
+
+
+class DriverFactory:
+    @staticmethod
+    def get_profile(name: Optional[str] = None) -> BrowserProfile:
+        """Look up a named profile, defaulting to settings.BROWSER_PROFILE"""
+        name = name or settings.BROWSER_PROFILE
+        try:
+            return PROFILES[name]
+        except KeyError:
+            raise ValueError(f"Unknown browser profile: {name} (available: {', '.join(PROFILES)})")
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    @staticmethod
+    def _acquire_data_dir(profile: BrowserProfile) -> Path:
+        """Claim a numbered copy of the profile's user-data-dir that no live driver is using.
+
+        Chrome locks its user-data-dir, so every concurrent driver (xdist workers, virtual users
+        in one process) needs its own slot. A slot is held by a .lock file naming the owning pid;
+        locks left by processes that no longer exist are taken over.
+        """
+        base = Path(settings.BROWSER_DATA_DIR).absolute() / profile.name
+        slot = 0
+        while True:
+            data_dir = base / f"slot-{slot}"
+            data_dir.mkdir(parents=True, exist_ok=True)
+            lock = data_dir / ".lock"
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    owner = int(lock.read_text() or 0)
+                except (OSError, ValueError):
+                    owner = 0
+                # An empty lock may be mid-write by its owner; only a recorded dead pid is stale
+                if owner and owner != os.getpid() and not DriverFactory._pid_alive(owner):
+                    lock.unlink(missing_ok=True)
+                    continue
+                slot += 1
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return data_dir
+
+    @staticmethod
+    def _release_data_dir(data_dir: Path):
+        (data_dir / ".lock").unlink(missing_ok=True)
+
+    @staticmethod
+    def _is_persistent(profile: BrowserProfile) -> bool:
+        # Only Chrome is given a user-data-dir; other browsers always start from a fresh profile
+        return profile.persistent and settings.BROWSER == "chrome"
+
+    @staticmethod
+    def _window_size() -> str:
+        return settings.WINDOW_SIZE.replace("x", ",")
+
+    @staticmethod
+    def _chrome_options(profile: BrowserProfile, data_dir: Optional[Path] = None) -> webdriver.ChromeOptions:
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = profile.page_load_strategy
+        if settings.HEADLESS:
+            options.add_argument("--headless=new")
+        options.add_argument(f"--window-size={DriverFactory._window_size()}")
+        if data_dir is not None:
+            options.add_argument(f"--user-data-dir={data_dir}")
+            options.add_argument(f"--disk-cache-dir={data_dir / 'cache'}")
+        for argument in profile.extra_arguments:
+            options.add_argument(argument)
+        return options
+
+    @staticmethod
+    def _firefox_options(profile: BrowserProfile) -> webdriver.FirefoxOptions:
+        options = webdriver.FirefoxOptions()
+        options.page_load_strategy = profile.page_load_strategy
+        if settings.HEADLESS:
+            options.add_argument("-headless")
+        width, height = DriverFactory._window_size().split(",")
+        options.add_argument(f"--width={width}")
+        options.add_argument(f"--height={height}")
+        return options
+
+    @staticmethod
+    def create(profile_name: Optional[str] = None, record_navigation: Optional[bool] = None):
+        """Create a WebDriver configured with the named performance profile.
+
+        Navigation timings are recorded when record_navigation is set, defaulting to settings.NAV_PROFILE.
+        """
+        profile = DriverFactory.get_profile(profile_name)
+        data_dir = None
+        if settings.BROWSER == "chrome":
+            if DriverFactory._is_persistent(profile):
+                data_dir = DriverFactory._acquire_data_dir(profile)
+            try:
+                driver = webdriver.Chrome(options=DriverFactory._chrome_options(profile, data_dir))
+            except Exception:
+                if data_dir is not None:
+                    DriverFactory._release_data_dir(data_dir)
+                raise
+            blocked = profile.blocked_urls + settings.BLOCKED_URL_PATTERNS
+            if blocked:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        elif settings.BROWSER == "firefox":
+            driver = webdriver.Firefox(options=DriverFactory._firefox_options(profile))
+            if profile.blocked_urls or settings.BLOCKED_URL_PATTERNS:
+                logger.warning(f"URL blocking requires CDP; ignored for firefox profile '{profile.name}'")
+        else:
+            raise ValueError(f"Unsupported browser: {settings.BROWSER}")
+        logger.info(f"{settings.BROWSER} driver created with '{profile.name}' profile")
+        if data_dir is not None:
+            DriverFactory._hold_until_quit(driver, data_dir)
+            DriverFactory._ensure_warm(driver, profile, data_dir)
+        if settings.NAV_PROFILE if record_navigation is None else record_navigation:
+            return EventFiringWebDriver(driver, NavigationTimer(profile.name))
+        return driver
+
+    @staticmethod
+    def _hold_until_quit(driver, data_dir: Path):
+        """Release the profile slot once the driver quits"""
+        quit_driver = driver.quit
+
+        def quit():
+            try:
+                quit_driver()
+            finally:
+                DriverFactory._release_data_dir(data_dir)
+        driver.quit = quit
+
+    @staticmethod
+    def _ensure_warm(driver, profile: BrowserProfile, data_dir: Path):
+        marker = data_dir / ".warmed"
+        if marker.exists():
+            return
+        DriverFactory.warm_up(driver)
+        marker.touch()
+        logger.info(f"Warmed '{profile.name}' profile cache")
+
+    @staticmethod
+    def warm_up(driver, urls: Optional[List[str]] = None):
+        """Visit the given pages once so a persistent profile starts with a populated cache"""
+        for url in urls or [settings.login_url]:
+            driver.get(url)
+
+
+# Global navigation log shared by every driver in the run
+navigation_log = NavigationLog()
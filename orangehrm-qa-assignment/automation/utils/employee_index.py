@@ -0,0 +1,111 @@
+import bisect
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from utils.reconciliation import api_record
+
+logger = logging.getLogger(__name__)
+
+# Signature of API/DB fallbacks: (name_or_id, prefix) -> found
+LookupFallback = Callable[[str, bool], bool]
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join((value or "").split()).lower()
+
+
+class EmployeeIndex:
+    """In-memory lookup of employee list rows by ID and full name, exact or by prefix.
+
+    PIM list rows carry "First (& Middle) Name" as first_middle_name; such rows answer to both
+    "First Middle Last" and "First Last".
+    """
+
+    def __init__(self, rows: Iterable[Dict] = ()):
+        self._count = 0
+        self._by_id: Dict[str, Dict] = {}
+        self._by_name: Dict[str, List[Dict]] = {}
+        self._sorted_ids: List[str] = []
+        self._sorted_names: List[str] = []
+        self._dirty = False
+        for row in rows:
+            self.add(row)
+
+    @staticmethod
+    def names(row: Dict) -> Set[str]:
+        given = _normalize(row.get("first_middle_name") or row.get("first_name"))
+        last = _normalize(row.get("last_name"))
+        names = {_normalize(f"{given} {last}")}
+        if given:
+            names.add(_normalize(f"{given.split()[0]} {last}"))
+        return names
+
+    def add(self, row: Dict):
+        emp_id = _normalize(row.get("emp_id"))
+        if emp_id:
+            self._by_id[emp_id] = row
+        for name in self.names(row):
+            self._by_name.setdefault(name, []).append(row)
+        self._count += 1
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _ensure_sorted(self):
+        if self._dirty:
+            self._sorted_ids = sorted(self._by_id)
+            self._sorted_names = sorted(self._by_name)
+            self._dirty = False
+
+    @staticmethod
+    def _prefixed(keys: List[str], prefix: str) -> List[str]:
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + "\uffff")
+        return keys[start:end]
+
+    def get(self, emp_id: str) -> Optional[Dict]:
+        return self._by_id.get(_normalize(emp_id))
+
+    def find(self, query: str, prefix: bool = False) -> List[Dict]:
+        """Rows whose ID or full name equals (or starts with) the query, case-insensitively"""
+        key = _normalize(query)
+        if prefix:
+            self._ensure_sorted()
+            by_name = [row for name in self._prefixed(self._sorted_names, key) for row in self._by_name[name]]
+            by_id = [self._by_id[emp_id] for emp_id in self._prefixed(self._sorted_ids, key)]
+        else:
+            by_name = self._by_name.get(key, [])
+            by_id = [self._by_id[key]] if key in self._by_id else []
+        seen = set()
+        matches = []
+        for row in by_name + by_id:
+            if id(row) not in seen:
+                seen.add(id(row))
+                matches.append(row)
+        return matches
+
+    def contains(self, query: str, prefix: bool = False) -> bool:
+        return bool(self.find(query, prefix))
+
+
+def api_employee_lookup(api, endpoint: str = "/employees") -> LookupFallback:
+    """Fallback that asks the employees API, then applies exact/prefix matching locally"""
+    def lookup(query: str, prefix: bool) -> bool:
+        items = api.get(endpoint, params={"nameOrId": query}).get("data", [])
+        return EmployeeIndex(api_record(item) for item in items).contains(query, prefix)
+    return lookup
+
+
+def db_employee_lookup(db) -> LookupFallback:
+    """Fallback that matches the employees table directly"""
+    def lookup(query: str, prefix: bool) -> bool:
+        key = _normalize(query)
+        if prefix:
+            pattern = key.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            condition = "lower(emp_id) LIKE %s OR lower(first_name || ' ' || last_name) LIKE %s"
+            params = (pattern, pattern)
+        else:
+            condition = "lower(emp_id) = %s OR lower(first_name || ' ' || last_name) = %s"
+            params = (key, key)
+        return bool(db.execute_query(f"SELECT 1 FROM employees WHERE {condition} LIMIT 1", params))
+    return lookup
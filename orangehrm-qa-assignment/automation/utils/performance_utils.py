@@ -5,10 +5,10 @@ from pathlib import Path
 import csv
 import statistics
 from functools import wraps
-import matplotlib.pyplot as plt
 import numpy as np
 import json
 from datetime import datetime
+from utils.dashboard import LiveRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -28,18 +28,26 @@ class PerformanceUtils:
     @staticmethod
     def benchmark(test_func: Callable, 
                  iterations: int = 10,
-                 warmup: int = 2) -> Dict[str, float]:
-        """Run performance benchmark with warmup cycles"""
+                 warmup: int = 2,
+                 live_name: Optional[str] = None) -> Dict[str, float]:
+        """Run performance benchmark with warmup cycles, optionally streaming samples to the dashboard"""
         # Warmup runs
         for _ in range(warmup):
             test_func()
 
         # Actual measurements
         timings = []
-        for i in range(iterations):
-            start_time = time.perf_counter()
-            test_func()
-            timings.append(time.perf_counter() - start_time)
+        live = LiveRecorder(live_name) if live_name else None
+        try:
+            for i in range(iterations):
+                start_time = time.perf_counter()
+                test_func()
+                timings.append(time.perf_counter() - start_time)
+                if live:
+                    live.record(timings[-1])
+        finally:
+            if live:
+                live.close()
         
         return {
             "iterations": iterations,
@@ -87,7 +95,8 @@ class PerformanceUtils:
     @staticmethod
     def visualize_results(results: Dict[str, Any],
                         output_dir: Path = Path("results/performance")):
-        """Generate performance visualizations"""
+        """Generate performance visualizations (static PNGs; see utils.dashboard for the interactive view)"""
+        import matplotlib.pyplot as plt
         output_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         timings = results['raw_times']
@@ -123,6 +132,7 @@ class PerformanceUtils:
                       current: Dict[str, Any],
                       output_dir: Path = Path("results/performance")) -> Path:
         """Generate comparison report between two test runs"""
+        import matplotlib.pyplot as plt
         output_dir.mkdir(parents=True, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
@@ -165,16 +175,24 @@ class PerformanceUtils:
     @staticmethod
     def load_test(test_func: Callable,
                  duration: int = 60,
-                 interval: int = 5) -> Dict[str, Any]:
-        """Run continuous load test"""
+                 interval: int = 5,
+                 live_name: Optional[str] = None) -> Dict[str, Any]:
+        """Run continuous load test, optionally streaming samples to the dashboard"""
         start_time = time.time()
         timings = []
+        live = LiveRecorder(live_name) if live_name else None
         
-        while time.time() - start_time < duration:
-            cycle_start = time.time()
-            test_func()
-            timings.append(time.time() - cycle_start)
-            time.sleep(max(0, interval - (time.time() - cycle_start)))
+        try:
+            while time.time() - start_time < duration:
+                cycle_start = time.time()
+                test_func()
+                timings.append(time.time() - cycle_start)
+                if live:
+                    live.record(timings[-1])
+                time.sleep(max(0, interval - (time.time() - cycle_start)))
+        finally:
+            if live:
+                live.close()
         
         return {
             "duration": duration,
@@ -183,3 +201,15 @@ class PerformanceUtils:
             "throughput": len(timings) / duration,
             "timings": timings
         }
+
+    @staticmethod
+    def distributed_load_test(test_func: Callable,
+                              workers: int = 4,
+                              rate: float = 100.0,
+                              duration: int = 60,
+                              remote_workers: int = 0) -> Dict[str, Any]:
+        """Run an open-loop load test across worker processes, sidestepping the GIL"""
+        from utils.distributed_load import LoadCoordinator
+        coordinator = LoadCoordinator(test_func, workers=workers, rate=rate,
+                                      duration=duration, remote_workers=remote_workers)
+        return coordinator.run()
@@ -0,0 +1,189 @@
+import os
+import re
+import json
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_COMMENT_RE = re.compile(r"(--[^\n]*)|(/\*.*?\*/)", re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_RE = re.compile(r"%(?:\([^)]+\))?s")
+_IN_LIST_RE = re.compile(r"\bin\s*\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@dataclass
+class QueryRecord:
+    fingerprint: str
+    duration_ms: float
+    rows: int
+    test: str
+    explain: Optional[List[str]] = None
+
+
+@dataclass
+class FingerprintStats:
+    fingerprint: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    tests: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class QueryProfiler:
+    """Collects per-query timings and flags slow or repeated statements"""
+
+    def __init__(self, slow_query_ms: Optional[float] = None,
+                 explain_slow: Optional[bool] = None,
+                 repeat_threshold: Optional[int] = None):
+        self.slow_query_ms = settings.DB_SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms
+        self.explain_slow = settings.DB_EXPLAIN_SLOW if explain_slow is None else explain_slow
+        self.repeat_threshold = settings.DB_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        self._lock = threading.Lock()
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._identical: Dict[tuple, int] = defaultdict(int)
+        # Highest identical-call counts per (test, fingerprint) taken from merged reports
+        self._merged_identical: Dict[tuple, int] = {}
+        self.slow_queries: List[QueryRecord] = []
+
+    @staticmethod
+    def fingerprint(query: str) -> str:
+        """Normalize SQL so statements differing only in literals share a key"""
+        sql = _COMMENT_RE.sub(" ", query)
+        sql = _STRING_RE.sub("?", sql)
+        sql = _PLACEHOLDER_RE.sub("?", sql)
+        sql = _NUMBER_RE.sub("?", sql)
+        sql = _WHITESPACE_RE.sub(" ", sql).strip().lower()
+        return _IN_LIST_RE.sub("in (?+)", sql)
+
+    @staticmethod
+    def current_test() -> str:
+        """Name of the running pytest test, as exported by pytest itself"""
+        current = os.environ.get("PYTEST_CURRENT_TEST", "")
+        return current.rsplit(" ", 1)[0] if current else "<no test>"
+
+    def is_slow(self, duration_ms: float) -> bool:
+        return duration_ms >= self.slow_query_ms
+
+    def record(self, query: str, params: Optional[tuple], duration_ms: float,
+               rows: int, explain: Optional[List[str]] = None) -> QueryRecord:
+        """Register a single executed statement"""
+        record = QueryRecord(
+            fingerprint=self.fingerprint(query),
+            duration_ms=duration_ms,
+            rows=rows,
+            test=self.current_test(),
+            explain=explain
+        )
+        with self._lock:
+            stats = self._stats.setdefault(record.fingerprint, FingerprintStats(record.fingerprint))
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.rows += rows
+            stats.tests[record.test] = stats.tests.get(record.test, 0) + 1
+            self._identical[(record.test, query, repr(params))] += 1
+            if self.is_slow(duration_ms):
+                self.slow_queries.append(record)
+        if self.is_slow(duration_ms):
+            logger.warning(f"Slow query ({duration_ms:.1f}ms) in {record.test}: {record.fingerprint}")
+        return record
+
+    def repeated_queries(self) -> List[Dict[str, Any]]:
+        """Fingerprints issued at least `repeat_threshold` times within one test (N+1 candidates)"""
+        with self._lock:
+            identical_by_key = defaultdict(int, self._merged_identical)
+            for (test, query, _), count in self._identical.items():
+                key = (test, self.fingerprint(query))
+                identical_by_key[key] = max(identical_by_key[key], count)
+            flagged = []
+            for stats in self._stats.values():
+                for test, count in stats.tests.items():
+                    if count >= self.repeat_threshold:
+                        flagged.append({
+                            "test": test,
+                            "fingerprint": stats.fingerprint,
+                            "calls": count,
+                            "max_identical_calls": identical_by_key[(test, stats.fingerprint)]
+                        })
+        return sorted(flagged, key=lambda f: f["calls"], reverse=True)
+
+    def report(self) -> Dict[str, Any]:
+        """Fingerprints ranked by total time plus slow and repeated query findings"""
+        with self._lock:
+            ranked = sorted(self._stats.values(), key=lambda s: s.total_ms, reverse=True)
+            fingerprints = [
+                {
+                    "fingerprint": s.fingerprint,
+                    "calls": s.calls,
+                    "total_ms": s.total_ms,
+                    "mean_ms": s.mean_ms,
+                    "max_ms": s.max_ms,
+                    "rows": s.rows,
+                    "tests": dict(s.tests)
+                }
+                for s in ranked
+            ]
+            slow = [asdict(r) for r in self.slow_queries]
+        return {
+            "total_queries": sum(f["calls"] for f in fingerprints),
+            "total_ms": sum(f["total_ms"] for f in fingerprints),
+            "slow_query_ms": self.slow_query_ms,
+            "fingerprints": fingerprints,
+            "slow_queries": slow,
+            "repeated_queries": self.repeated_queries()
+        }
+
+    def merge_report(self, report: Dict[str, Any]):
+        """Fold a report written by another process (e.g. an xdist worker) into this profiler"""
+        with self._lock:
+            for entry in report.get("fingerprints", []):
+                stats = self._stats.setdefault(entry["fingerprint"], FingerprintStats(entry["fingerprint"]))
+                stats.calls += entry["calls"]
+                stats.total_ms += entry["total_ms"]
+                stats.max_ms = max(stats.max_ms, entry["max_ms"])
+                stats.rows += entry["rows"]
+                for test, count in entry["tests"].items():
+                    stats.tests[test] = stats.tests.get(test, 0) + count
+            self.slow_queries.extend(QueryRecord(**r) for r in report.get("slow_queries", []))
+            for finding in report.get("repeated_queries", []):
+                key = (finding["test"], finding["fingerprint"])
+                self._merged_identical[key] = max(self._merged_identical.get(key, 0),
+                                                  finding["max_identical_calls"])
+
+    def save_report(self, output_dir: Path = Path("results/performance"),
+                    file_name: Optional[str] = None) -> Optional[Path]:
+        """Write the query report as JSON; returns None when nothing was recorded"""
+        if not self._stats:
+            return None
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = output_dir / (file_name or f"query_report_{timestamp}.json")
+        with open(report_path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+        logger.info(f"Query profile saved: {report_path}")
+        return report_path
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._identical.clear()
+            self._merged_identical.clear()
+            self.slow_queries.clear()
+
+
+# Global profiler shared by every DatabaseUtils instance in the run
+query_profiler = QueryProfiler()
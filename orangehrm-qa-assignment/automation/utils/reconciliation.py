@@ -0,0 +1,431 @@
+import json
+import math
+import time
+import heapq
+import shutil
+import hashlib
+import logging
+import argparse
+import tempfile
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Canonical employee fields compared across sources
+EMPLOYEE_FIELDS = ("emp_id", "first_name", "last_name")
+
+# Employees API field name -> canonical field name
+API_FIELD_MAP = {"empId": "emp_id", "firstName": "first_name", "lastName": "last_name"}
+
+# The PIM Employee List shows first and middle names in one column, so first names
+# cannot be compared reliably against it
+PIM_FIELDS = ("emp_id", "last_name")
+
+# COLLATE "C" gives byte order, which matches Python's str ordering for the merge
+DB_EMPLOYEE_QUERY = 'SELECT emp_id, first_name, last_name FROM employees ORDER BY emp_id COLLATE "C"'
+
+
+class SortedByKey:
+    """Marks a record stream as sorted by `key` in byte order, which lets reconcile() merge it"""
+
+    def __init__(self, records: Iterable[Dict], key: str = "emp_id"):
+        self.records = records
+        self.key = key
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.records)
+
+
+def api_record(item: Dict) -> Dict:
+    """Rename an employees API item's fields to the canonical names"""
+    return {API_FIELD_MAP.get(k, k): v for k, v in item.items()}
+
+
+def db_employees(db, batch_size: int = 5000) -> SortedByKey:
+    """Stream employees from the database, sorted by emp_id"""
+    return SortedByKey(db.stream_query(DB_EMPLOYEE_QUERY, batch_size=batch_size))
+
+
+def api_employees(api, endpoint: str = "/employees", page_size: int = 100) -> Iterator[Dict]:
+    """Page through the employees API in its own order, renaming fields to the canonical names"""
+    for item in api.get_paginated(endpoint, page_size=page_size):
+        yield api_record(item)
+
+
+def pim_record(row: Dict) -> Dict:
+    """Map a PIM Employee List row to the canonical fields it can be compared on (PIM_FIELDS)"""
+    return {"emp_id": row.get("emp_id"), "last_name": row.get("last_name"),
+            "first_middle_name": row.get("first_middle_name")}
+
+
+def pim_employees(pim_page) -> Iterator[Dict]:
+    """Snapshot the unfiltered PIM Employee List across all pages"""
+    pim_page.navigate_to_pim()
+    pim_page.search_employee("")
+    for row in pim_page.iter_employee_rows():
+        yield pim_record(row)
+
+
+def _sort_key(record: Dict, key: str) -> str:
+    value = record.get(key)
+    return "" if value is None else str(value)
+
+
+def external_sort(records: Iterable[Dict], key: str = "emp_id", chunk_size: int = 100_000,
+                  tmp_dir: Optional[Path] = None) -> SortedByKey:
+    """Sort a record stream by key holding at most chunk_size records in memory.
+
+    Sorted chunks are spilled to JSONL files and combined lazily with heapq.merge.
+    """
+    def sorted_records() -> Iterator[Dict]:
+        work_dir = Path(tempfile.mkdtemp(prefix="reconcile_", dir=tmp_dir))
+        files = []
+        try:
+            chunk: List[Dict] = []
+            iterator = iter(records)
+            while True:
+                chunk.extend(record for _, record in zip(range(chunk_size), iterator))
+                if not chunk:
+                    break
+                chunk.sort(key=lambda r: _sort_key(r, key))
+                path = work_dir / f"chunk_{len(files):05d}.jsonl"
+                with open(path, "w") as f:
+                    f.writelines(json.dumps(r, default=str) + "\n" for r in chunk)
+                chunk = []
+                files.append(open(path))
+            streams = [(json.loads(line) for line in f) for f in files]
+            yield from heapq.merge(*streams, key=lambda r: _sort_key(r, key))
+        finally:
+            for f in files:
+                f.close()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return SortedByKey(sorted_records(), key)
+
+
+def _normalize(value) -> str:
+    return "" if value is None else " ".join(str(value).split())
+
+
+def record_digest(record: Dict, fields: Tuple[str, ...] = EMPLOYEE_FIELDS) -> bytes:
+    """Stable 16-byte digest of the compared fields of a record"""
+    payload = "\x1f".join(_normalize(record.get(f)) for f in fields)
+    return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+
+@dataclass
+class ReconciliationResult:
+    left: str
+    right: str
+    mode: str
+    compared: int = 0
+    matched: int = 0
+    mismatched: int = 0
+    missing_in_left: int = 0
+    missing_in_right: int = 0
+    # Records skipped for a NULL/blank or duplicate key; not counted in `compared`
+    invalid_keys: int = 0
+    elapsed: float = 0.0
+    diff_path: Optional[str] = None
+
+    @property
+    def records_per_second(self) -> float:
+        return self.compared / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.mismatched or self.missing_in_left or self.missing_in_right or self.invalid_keys)
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), records_per_second=self.records_per_second)
+
+
+class Reconciler:
+    """Compares two record streams by key with bounded memory and writes a JSONL diff.
+
+    ``merge`` mode streams both inputs in key order, holding one record from each side
+    at a time; inputs not wrapped in SortedByKey are first put through external_sort.
+    ``hash`` mode keeps the compared fields of the whole left side in memory and is only
+    worth choosing for small inputs. Records with a NULL/blank or duplicate key are
+    reported as ``invalid_key`` diff entries.
+    """
+
+    def __init__(self, key: str = "emp_id", fields: Tuple[str, ...] = EMPLOYEE_FIELDS,
+                 output_dir: Optional[Path] = Path("results/reconciliation"),
+                 sort_chunk_size: int = 100_000):
+        self.key = key
+        self.fields = fields
+        self.output_dir = output_dir
+        self.sort_chunk_size = sort_chunk_size
+
+    def reconcile(self, left: Iterable[Dict], right: Iterable[Dict],
+                  left_name: str = "db", right_name: str = "api",
+                  mode: Optional[str] = None) -> ReconciliationResult:
+        """Compare two sources and return summary counts; differences go to the diff file"""
+        mode = mode or "merge"
+        if mode not in ("merge", "hash"):
+            raise ValueError(f"Unsupported reconciliation mode: {mode}")
+        result = ReconciliationResult(left=left_name, right=right_name, mode=mode)
+        start_time = time.perf_counter()
+        with self._open_diff(left_name, right_name) as emit:
+            if mode == "merge":
+                diffs = self._merge(self._sorted(left), self._sorted(right))
+            else:
+                diffs = self._hash_join(left, right)
+            for kind, key, detail in diffs:
+                if kind == "invalid_key":
+                    result.invalid_keys += 1
+                    emit({"type": kind, self.key: key, **detail})
+                    continue
+                result.compared += 1
+                if kind == "match":
+                    result.matched += 1
+                    continue
+                setattr(result, kind, getattr(result, kind) + 1)
+                emit({"type": kind, self.key: key, **detail})
+        result.elapsed = time.perf_counter() - start_time
+        result.diff_path = str(self._diff_path) if self._diff_path else None
+        logger.info(
+            f"Reconciled {left_name} vs {right_name}: {result.compared} keys, "
+            f"{result.mismatched} mismatched, {result.missing_in_left} missing in {left_name}, "
+            f"{result.missing_in_right} missing in {right_name}, {result.invalid_keys} invalid keys "
+            f"({result.records_per_second:,.0f} records/s)"
+        )
+        return result
+
+    def _sorted(self, records: Iterable[Dict]) -> Iterable[Dict]:
+        if isinstance(records, SortedByKey) and records.key == self.key:
+            return records
+        return external_sort(records, self.key, self.sort_chunk_size)
+
+    def _key(self, record: Dict) -> Optional[str]:
+        value = record.get(self.key)
+        key = None if value is None else str(value)
+        return key if key and key.strip() else None
+
+    def _field_diff(self, left: Dict, right: Dict) -> Dict:
+        return {
+            "fields": {
+                f: [left.get(f), right.get(f)]
+                for f in self.fields
+                if _normalize(left.get(f)) != _normalize(right.get(f))
+            }
+        }
+
+    def _merge(self, left: Iterable[Dict], right: Iterable[Dict]) -> Iterator[Tuple[str, str, Dict]]:
+        invalid: List[Tuple[str, str, Dict]] = []
+        left_iter = self._checked_sorted(left, "left", invalid)
+        right_iter = self._checked_sorted(right, "right", invalid)
+        lrec = next(left_iter, None)
+        rrec = next(right_iter, None)
+        while lrec is not None or rrec is not None:
+            yield from invalid
+            invalid.clear()
+            lkey = None if lrec is None else self._key(lrec)
+            rkey = None if rrec is None else self._key(rrec)
+            if rkey is None or (lkey is not None and lkey < rkey):
+                yield "missing_in_right", lkey, {}
+                lrec = next(left_iter, None)
+            elif lkey is None or rkey < lkey:
+                yield "missing_in_left", rkey, {}
+                rrec = next(right_iter, None)
+            else:
+                if record_digest(lrec, self.fields) == record_digest(rrec, self.fields):
+                    yield "match", lkey, {}
+                else:
+                    yield "mismatched", lkey, self._field_diff(lrec, rrec)
+                lrec = next(left_iter, None)
+                rrec = next(right_iter, None)
+        yield from invalid
+
+    def _checked_sorted(self, records: Iterable[Dict], side: str,
+                        invalid: List[Tuple[str, str, Dict]]) -> Iterator[Dict]:
+        """Yield records with valid keys in strictly increasing order, diverting bad keys to `invalid`"""
+        previous = None
+        for record in records:
+            key = self._key(record)
+            if key is None:
+                invalid.append(("invalid_key", record.get(self.key), {"side": side, "reason": "null"}))
+                continue
+            if previous is not None and key == previous:
+                invalid.append(("invalid_key", key, {"side": side, "reason": "duplicate"}))
+                continue
+            if previous is not None and key < previous:
+                raise ValueError(f"{side} input is not sorted by {self.key}: {previous!r} then {key!r}")
+            previous = key
+            yield record
+
+    def _hash_join(self, left: Iterable[Dict], right: Iterable[Dict]) -> Iterator[Tuple[str, str, Dict]]:
+        # Compared field values rather than digests, so mismatches carry the same
+        # per-field [left, right] pairs as merge mode
+        built: Dict[str, Tuple] = {}
+        for record in left:
+            key = self._key(record)
+            if key is None or key in built:
+                reason = "null" if key is None else "duplicate"
+                yield "invalid_key", record.get(self.key) if key is None else key, {"side": "left", "reason": reason}
+                continue
+            built[key] = tuple(record.get(f) for f in self.fields)
+        for record in right:
+            key = self._key(record)
+            if key is None:
+                yield "invalid_key", record.get(self.key), {"side": "right", "reason": "null"}
+                continue
+            values = built.pop(key, None)
+            if values is None:
+                yield "missing_in_left", key, {}
+                continue
+            detail = self._field_diff(dict(zip(self.fields, values)), record)
+            if detail["fields"]:
+                yield "mismatched", key, detail
+            else:
+                yield "match", key, {}
+        for key in sorted(built):
+            yield "missing_in_right", key, {}
+
+    def _open_diff(self, left_name: str, right_name: str):
+        self._diff_path = None
+        if self.output_dir is None:
+            return _NullDiff()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._diff_path = self.output_dir / f"diff_{left_name}_{right_name}_{timestamp}.jsonl"
+        return _JsonlDiff(self._diff_path)
+
+
+class _JsonlDiff:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def __enter__(self) -> Callable[[Dict], None]:
+        self._file = open(self.path, "w")
+        return lambda entry: self._file.write(json.dumps(entry, default=str) + "\n")
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+
+
+class _NullDiff:
+    def __enter__(self) -> Callable[[Dict], None]:
+        return lambda entry: None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+def synthetic_employees(count: int, drift_every: int = 0, skip_every: int = 0,
+                        unsorted: bool = False) -> Iterable[Dict]:
+    """Local stand-in for an employee source, with optional drift and gaps.
+
+    Sorted by default; `unsorted` yields the same rows in a scrambled order, like the API.
+    """
+    rows = _synthetic_rows(count, drift_every, skip_every, unsorted)
+    return rows if unsorted else SortedByKey(rows)
+
+
+def _synthetic_rows(count: int, drift_every: int, skip_every: int, unsorted: bool) -> Iterator[Dict]:
+    # Stepping by a stride coprime to count visits every index once without materializing a shuffle
+    stride = 7919 if unsorted else 1
+    while math.gcd(stride, count) != 1:
+        stride += 2
+    for n in range(count):
+        i = n * stride % count
+        if skip_every and i % skip_every == 0:
+            continue
+        last_name = f"Last{i}-changed" if drift_every and i % drift_every == 0 else f"Last{i}"
+        yield {"emp_id": f"E{i:09d}", "first_name": f"First{i}", "last_name": last_name}
+
+
+def benchmark_reconciliation(rows: int = 1_000_000, modes: Tuple[str, ...] = ("merge", "hash"),
+                             track_memory: bool = False) -> List[Dict]:
+    """Measure reconciliation throughput against synthetic sources of `rows` records.
+
+    Each mode runs against a sorted and an unsorted right side; track_memory adds the
+    tracemalloc peak, which shows hash mode growing with the input (and slows the run).
+    """
+    import tracemalloc
+    reconciler = Reconciler(output_dir=None)
+    results = []
+    for mode in modes:
+        for unsorted in (False, True):
+            if track_memory:
+                tracemalloc.start()
+            result = reconciler.reconcile(
+                synthetic_employees(rows),
+                synthetic_employees(rows, drift_every=1000, skip_every=5000, unsorted=unsorted),
+                left_name="synthetic_db", right_name="synthetic_api", mode=mode
+            )
+            summary = dict(result.to_dict(), right_input="unsorted" if unsorted else "sorted")
+            if track_memory:
+                summary["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+                tracemalloc.stop()
+            results.append(summary)
+    return results
+
+
+def reconcile_sources(left: str = "db", right: str = "api", mode: Optional[str] = None,
+                      output_dir: Path = Path("results/reconciliation")) -> ReconciliationResult:
+    """Reconcile two live employee sources ("db", "api" or "pim") and write the diff"""
+    opened = []
+
+    def open_source(name: str) -> Iterable[Dict]:
+        if name == "db":
+            from utils.db_utils import DatabaseUtils
+            db = DatabaseUtils()
+            opened.append(db.close)
+            return db_employees(db)
+        if name == "api":
+            from utils.api_utils import APIUtils
+            api = APIUtils()
+            opened.append(api.close)
+            return api_employees(api)
+        if name == "pim":
+            # Imported here so db/api reconciliation does not require selenium
+            from config.settings import settings
+            from utils.driver_factory import DriverFactory
+            from pages.login_page import LoginPage
+            from pages.pim_page import PIMPage
+            driver = DriverFactory.create()
+            opened.append(driver.quit)
+            LoginPage(driver).login(settings.ADMIN_USER["username"], settings.ADMIN_USER["password"])
+            return pim_employees(PIMPage(driver))
+        raise ValueError(f"Unknown employee source: {name}")
+
+    fields = PIM_FIELDS if "pim" in (left, right) else EMPLOYEE_FIELDS
+    try:
+        return Reconciler(fields=fields, output_dir=output_dir).reconcile(
+            open_source(left), open_source(right), left_name=left, right_name=right, mode=mode
+        )
+    finally:
+        for close in reversed(opened):
+            close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile employee data across sources")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = subparsers.add_parser("reconcile", help="compare two live sources and write a JSONL diff")
+    reconcile.add_argument("--left", choices=["db", "api", "pim"], default="db")
+    reconcile.add_argument("--right", choices=["db", "api", "pim"], default="api")
+    reconcile.add_argument("--mode", choices=["merge", "hash"],
+                           help="default: merge, sorting unsorted sides on disk first; "
+                                "hash keeps the whole left side in memory")
+    reconcile.add_argument("--output", type=Path, default=Path("results/reconciliation"))
+
+    benchmark = subparsers.add_parser("benchmark", help="measure throughput on synthetic sources")
+    benchmark.add_argument("--rows", type=int, default=1_000_000)
+    benchmark.add_argument("--mode", choices=["merge", "hash"], action="append")
+    benchmark.add_argument("--memory", action="store_true", help="report tracemalloc peak memory per run")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == "reconcile":
+        result = reconcile_sources(args.left, args.right, args.mode, args.output)
+        print(json.dumps(result.to_dict(), indent=2))
+        raise SystemExit(0 if result.consistent else 1)
+    for summary in benchmark_reconciliation(args.rows, tuple(args.mode or ("merge", "hash")), args.memory):
+        print(json.dumps(summary, indent=2))
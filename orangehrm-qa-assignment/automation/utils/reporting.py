@@ -0,0 +1,250 @@
+import os
+import sys
+import json
+import html
+import time
+import shutil
+import socket
+import logging
+import argparse
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# A test's status is the most severe outcome over its setup/call/teardown phases
+_SEVERITY = {"passed": 0, "skipped": 1, "xfailed": 1, "xpassed": 2, "failed": 3, "error": 4}
+
+
+def default_run_id() -> str:
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{socket.gethostname()}_{os.getpid()}"
+
+
+class ResultStore:
+    """Append-only JSONL store of per-test results, written while the tests run.
+
+    Reusing a run id starts the store over: the previous run's records and its done marker
+    are discarded, so the builder neither stops early nor adds up durations from both runs.
+    """
+
+    def __init__(self, store_dir: Path, run_id: str):
+        store_dir.mkdir(parents=True, exist_ok=True)
+        self.path = store_dir / f"{run_id}.jsonl"
+        self.done_path = store_dir / f"{run_id}.done"
+        self.run_id = run_id
+        self.done_path.unlink(missing_ok=True)
+        # Line buffering keeps each result visible to the builder as soon as it is written
+        self._file = open(self.path, "w", buffering=1)
+
+    @staticmethod
+    def _outcome(report) -> str:
+        if hasattr(report, "wasxfail"):
+            return "xfailed" if report.skipped else "xpassed"
+        if report.failed and report.when != "call":
+            return "error"
+        return report.outcome
+
+    def append(self, report):
+        """Record every phase of a pytest TestReport; empty artifact lists and passing output are left out"""
+        # Under xdist the controller receives worker reports with the originating node attached
+        node = getattr(report, "node", None)
+        record = {
+            "run": self.run_id,
+            "nodeid": report.nodeid,
+            "phase": report.when,
+            "outcome": self._outcome(report),
+            "duration": report.duration,
+            "stop": getattr(report, "stop", time.time()),
+            "worker": node.gateway.id if node is not None else "main"
+        }
+        artifacts = [value for name, value in report.user_properties if name == "artifact"]
+        if artifacts:
+            record["artifacts"] = artifacts
+        if report.failed:
+            record["message"] = report.longreprtext[-4000:]
+        self._file.write(json.dumps(record, default=str) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class ReportBuilder:
+    """Folds result store files into a summary and a static HTML report, reading only new lines"""
+
+    def __init__(self, sources: Iterable[Path], output_dir: Path):
+        self.sources = [Path(s) for s in sources]
+        self.output_dir = output_dir
+        self._offsets: Dict[Path, int] = {}
+        self.tests: Dict[str, Dict[str, Any]] = {}
+
+    def _files(self) -> List[Path]:
+        files = []
+        for source in self.sources:
+            files.extend(sorted(source.glob("*.jsonl")) if source.is_dir() else [source])
+        return files
+
+    def poll(self) -> int:
+        """Consume newly appended complete lines; returns the number of records read"""
+        read = 0
+        for path in self._files():
+            if not path.exists():
+                continue
+            with open(path, "rb") as f:
+                f.seek(self._offsets.get(path, 0))
+                chunk = f.read()
+            # A partially written last line is left for the next poll
+            complete = chunk[:chunk.rfind(b"\n") + 1]
+            self._offsets[path] = self._offsets.get(path, 0) + len(complete)
+            for line in complete.splitlines():
+                if line.strip():
+                    self._add(json.loads(line))
+                    read += 1
+        return read
+
+    def _add(self, record: Dict[str, Any]):
+        key = f"{record['run']}::{record['nodeid']}"
+        test = self.tests.setdefault(key, {
+            "nodeid": record["nodeid"], "run": record["run"], "worker": record["worker"],
+            "outcome": "passed", "duration": 0.0, "phases": {}, "stop": 0.0, "messages": [], "artifacts": []
+        })
+        if _SEVERITY.get(record["outcome"], 0) >= _SEVERITY.get(test["outcome"], 0):
+            test["outcome"] = record["outcome"]
+        test["duration"] += record["duration"]
+        test["phases"][record["phase"]] = test["phases"].get(record["phase"], 0.0) + record["duration"]
+        test["stop"] = max(test["stop"], record["stop"])
+        test["artifacts"].extend(record.get("artifacts", []))
+        if record.get("message"):
+            test["messages"].append(f"[{record['phase']}] {record['message']}")
+
+    def summary(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for test in self.tests.values():
+            counts[test["outcome"]] = counts.get(test["outcome"], 0) + 1
+        slowest = sorted(self.tests.values(), key=lambda t: t["duration"], reverse=True)[:20]
+        return {
+            "runs": sorted({t["run"] for t in self.tests.values()}),
+            "total": len(self.tests),
+            "outcomes": counts,
+            "total_duration": sum(t["duration"] for t in self.tests.values()),
+            "slowest": [{"nodeid": t["nodeid"], "duration": t["duration"], "phases": t["phases"]} for t in slowest]
+        }
+
+    @staticmethod
+    def _write_atomic(path: Path, content: str):
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+
+    def render(self):
+        """Write summary.json and index.html into the output directory"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+        self._write_atomic(self.output_dir / "summary.json", json.dumps(summary, indent=2))
+        self._write_atomic(self.output_dir / "index.html", self._html(summary))
+
+    def _html(self, summary: Dict[str, Any]) -> str:
+        ordered = sorted(self.tests.values(), key=lambda t: (-_SEVERITY.get(t["outcome"], 0), -t["duration"]))
+        rows = []
+        for test in ordered:
+            details = "".join(f"<pre>{html.escape(m)}</pre>" for m in test["messages"])
+            details += "".join(f'<a href="{html.escape(str(a))}">{html.escape(Path(str(a)).name)}</a> '
+                               for a in test["artifacts"])
+            phases = ", ".join(f"{phase} {duration:.2f}s" for phase, duration in test["phases"].items())
+            rows.append(
+                f'<tr class="{test["outcome"]}"><td>{html.escape(test["nodeid"])}</td><td>{test["outcome"]}</td>'
+                f'<td title="{phases}">{test["duration"]:.2f}s</td><td>{html.escape(test["worker"])}</td>'
+                f'<td>{details}</td></tr>'
+            )
+        counts = ", ".join(f"{count} {outcome}" for outcome, count in sorted(summary["outcomes"].items()))
+        return (
+            "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Test Report</title><style>"
+            "body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;width:100%}"
+            "td,th{border:1px solid #ddd;padding:4px;vertical-align:top;text-align:left}"
+            ".failed,.error{background:#fdd}.skipped,.xfailed{background:#ffd}.passed{background:#efe}"
+            "pre{white-space:pre-wrap;max-height:20em;overflow:auto}</style></head><body>"
+            f"<h1>Test Report</h1><p>{summary['total']} tests: {counts or 'none yet'}"
+            f" &middot; {summary['total_duration']:.1f}s test time &middot; runs: {html.escape(', '.join(summary['runs']))}"
+            f" &middot; updated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>"
+            "<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Worker</th><th>Details</th></tr>"
+            + "".join(rows) + "</table></body></html>"
+        )
+
+    def watch(self, done_file: Path, interval: float = 2.0):
+        """Re-render whenever new results arrive until done_file appears, then do a final pass"""
+        while not done_file.exists():
+            if self.poll():
+                self.render()
+            deadline = time.time() + interval
+            while time.time() < deadline and not done_file.exists():
+                time.sleep(0.1)
+        self.poll()
+        self.render()
+
+    @staticmethod
+    def spawn(store_file: Path, output_dir: Path, done_file: Path,
+              allure_results: Optional[Path] = None, allure_output: Optional[Path] = None) -> subprocess.Popen:
+        """Start a background `watch` process for a running session"""
+        command = [sys.executable, "-m", "utils.reporting", "watch", str(store_file.absolute()),
+                   "--output", str(output_dir.absolute()), "--done-file", str(done_file.absolute())]
+        if allure_results and allure_output:
+            command += ["--allure-results", str(allure_results.absolute()),
+                        "--allure-output", str(allure_output.absolute())]
+        return subprocess.Popen(command, cwd=Path(__file__).resolve().parent.parent)
+
+
+def generate_allure_report(results_dir: Path, output_dir: Path) -> Optional[subprocess.Popen]:
+    """Start `allure generate` detached; None when the allure CLI is not installed"""
+    executable = shutil.which("allure")
+    if executable is None:
+        logger.warning("allure CLI not found; skipping Allure report generation")
+        return None
+    logger.info(f"Generating Allure report in background: {output_dir}")
+    return subprocess.Popen([executable, "generate", str(results_dir), "-o", str(output_dir), "--clean"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+
+
+def merge_allure_results(sources: Iterable[Path], output_dir: Path) -> int:
+    """Copy allure-results from several shards into one directory; file names are UUIDs, so they do not collide"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for source in sources:
+        for path in Path(source).glob("*"):
+            if path.is_file():
+                shutil.copy2(path, output_dir / path.name)
+                copied += 1
+    return copied
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental test report builder")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    watch = subparsers.add_parser("watch", help="follow a result store during a run")
+    watch.add_argument("store", type=Path)
+    watch.add_argument("--output", type=Path, required=True)
+    watch.add_argument("--done-file", type=Path, required=True)
+    watch.add_argument("--interval", type=float, default=2.0)
+    watch.add_argument("--allure-results", type=Path, help="allure-results directory to render once the run ends")
+    watch.add_argument("--allure-output", type=Path)
+
+    merge = subparsers.add_parser("merge", help="merge result stores from several shards or CI jobs")
+    merge.add_argument("stores", type=Path, nargs="+", help="store files or directories of *.jsonl")
+    merge.add_argument("--output", type=Path, required=True)
+    merge.add_argument("--allure", type=Path, nargs="*", default=[], help="allure-results directories to combine")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == "watch":
+        ReportBuilder([args.store], args.output).watch(args.done_file, args.interval)
+        if args.allure_results and args.allure_output and args.allure_results.exists():
+            generate_allure_report(args.allure_results, args.allure_output)
+    else:
+        builder = ReportBuilder(args.stores, args.output)
+        builder.poll()
+        builder.render()
+        logger.info(f"Merged {len(builder.tests)} tests into {args.output / 'index.html'}")
+        if args.allure:
+            copied = merge_allure_results(args.allure, args.output / "allure_results")
+            logger.info(f"Combined {copied} allure result files into {args.output / 'allure_results'}")
@@ -0,0 +1,357 @@
+import json
+import time
+import random
+import string
+import logging
+import argparse
+import statistics
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Union
+from config.settings import settings
+from utils.api_utils import APIUtils
+
+logger = logging.getLogger(__name__)
+
+
+class ThinkTime:
+    """Pause between steps drawn from a named distribution, in seconds"""
+
+    DISTRIBUTIONS = {
+        "constant": lambda rng, o: o.get("value", 0),
+        "uniform": lambda rng, o: rng.uniform(o["min"], o["max"]),
+        "exponential": lambda rng, o: rng.expovariate(1 / o["mean"]),
+        "normal": lambda rng, o: rng.gauss(o["mean"], o["stdev"]),
+    }
+
+    def __init__(self, distribution: str = "constant", **options):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown think-time distribution: {distribution}")
+        self.distribution = distribution
+        self.options = options
+        # Draw once so a bad spec fails when the scenario loads, not in a virtual user mid-run
+        try:
+            self.sample(random.Random(0))
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            raise ValueError(f"Invalid {distribution} think time {options}: {e!r}")
+
+    @classmethod
+    def from_spec(cls, spec: Union[None, float, Dict[str, Any], "ThinkTime"]) -> "ThinkTime":
+        if isinstance(spec, ThinkTime):
+            return spec
+        if spec is None:
+            return cls()
+        if isinstance(spec, (int, float)):
+            return cls("constant", value=spec)
+        return cls(**spec)
+
+    def sample(self, rng: random.Random) -> float:
+        return max(0.0, self.DISTRIBUTIONS[self.distribution](rng, self.options))
+
+
+@dataclass
+class Step:
+    action: str
+    think_time: Optional[ThinkTime] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Journey:
+    name: str
+    weight: float
+    steps: List[Step]
+
+
+@dataclass
+class Scenario:
+    name: str
+    journeys: List[Journey]
+    think_time: ThinkTime = field(default_factory=ThinkTime)
+    data: str = "employee"
+    data_options: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, spec: Dict[str, Any]) -> "Scenario":
+        data = spec.get("data", "employee")
+        if isinstance(data, str):
+            data = {"generator": data}
+        data = dict(data)
+        journeys = []
+        for journey in spec["journeys"]:
+            steps = []
+            for step in journey["steps"]:
+                if isinstance(step, str):
+                    step = {"action": step}
+                think_time = step.get("think_time")
+                steps.append(Step(
+                    action=step["action"],
+                    think_time=ThinkTime.from_spec(think_time) if think_time is not None else None,
+                    params=step.get("params", {})
+                ))
+            journeys.append(Journey(journey["name"], float(journey.get("weight", 1)), steps))
+        return cls(
+            name=spec.get("name", "scenario"),
+            journeys=journeys,
+            think_time=ThinkTime.from_spec(spec.get("think_time")),
+            data=data.pop("generator", "employee"),
+            data_options=data
+        )
+
+
+def load_scenario(path: Path) -> Scenario:
+    """Load a scenario definition from a YAML or JSON file"""
+    path = Path(path)
+    with open(path) as f:
+        if path.suffix in (".yaml", ".yml"):
+            import yaml
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    return Scenario.from_dict(spec)
+
+
+# Data generators: name -> factory(rng, **options) returning a fresh dict per journey
+DATA_GENERATORS: Dict[str, Callable[..., Dict[str, Any]]] = {}
+
+
+def data_generator(name: str):
+    def register(func):
+        DATA_GENERATORS[name] = func
+        return func
+    return register
+
+
+@data_generator("employee")
+def employee_data(rng: random.Random, search_terms: Optional[List[str]] = None, **options) -> Dict[str, Any]:
+    suffix = "".join(rng.choice(string.ascii_lowercase) for _ in range(6))
+    first_name, last_name = f"Load{suffix.capitalize()}", f"User{suffix.capitalize()}"
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "emp_id": f"L{rng.randrange(10 ** 7):07d}",
+        "search_term": rng.choice(search_terms) if search_terms else f"{first_name} {last_name}"
+    }
+
+
+# Step names a scenario may use; every action level implements all of them
+ACTIONS = ("login", "search", "view", "add", "delete")
+
+
+def _added_employee(ctx: Dict[str, Any]):
+    """The employee created by this journey's add step; delete never touches anything else"""
+    if ctx.get("added_employee") is None:
+        raise ValueError("delete step requires an add step earlier in the same journey")
+    return ctx.pop("added_employee")
+
+
+class APIActions:
+    """Journey steps at API level; one instance per virtual user"""
+
+    def __init__(self):
+        self.api = None
+
+    def login(self, ctx: Dict[str, Any]):
+        if self.api:
+            self.api.close()
+        self.api = APIUtils()
+
+    def search(self, ctx: Dict[str, Any]):
+        ctx["results"] = self.api.get("/employees", params={"nameOrId": ctx["search_term"]}).get("data", [])
+
+    def view(self, ctx: Dict[str, Any]):
+        results = ctx.get("results") or [{"empNumber": ctx.get("emp_number")}]
+        if results[0].get("empNumber") is not None:
+            self.api.get(f"/employees/{results[0]['empNumber']}")
+
+    def add(self, ctx: Dict[str, Any]):
+        response = self.api.post("/employees", data={
+            "firstName": ctx["first_name"], "lastName": ctx["last_name"], "empId": ctx["emp_id"]
+        })
+        ctx["emp_number"] = response.get("data", {}).get("empNumber", ctx["emp_id"])
+        ctx["search_term"] = f"{ctx['first_name']} {ctx['last_name']}"
+        ctx["added_employee"] = ctx["emp_number"]
+
+    def delete(self, ctx: Dict[str, Any]):
+        self.api.delete(f"/employees/{_added_employee(ctx)}")
+
+    def close(self):
+        if self.api:
+            self.api.close()
+
+
+class BrowserActions:
+    """Journey steps driven through the PIM pages for smoke checks"""
+
+    def __init__(self):
+        # Imported here so API-level load runs do not require selenium
+        from utils.driver_factory import DriverFactory
+        from pages.login_page import LoginPage
+        from pages.pim_page import PIMPage
+        self.driver = DriverFactory.create()
+        self.login_page = LoginPage(self.driver)
+        self.pim_page = PIMPage(self.driver)
+
+    def login(self, ctx: Dict[str, Any]):
+        # Each journey starts a fresh session; the previous one left the driver logged in on a PIM page
+        self.driver.delete_all_cookies()
+        self.driver.get(settings.login_url)
+        self.login_page.login(settings.ADMIN_USER["username"], settings.ADMIN_USER["password"])
+
+    def search(self, ctx: Dict[str, Any]):
+        self.pim_page.navigate_to_pim()
+        self.pim_page.search_employee(ctx["search_term"])
+
+    def view(self, ctx: Dict[str, Any]):
+        self.pim_page.click(self.pim_page.EMPLOYEE_RECORD)
+
+    def add(self, ctx: Dict[str, Any]):
+        self.pim_page.navigate_to_pim()
+        self.pim_page.add_employee(ctx["first_name"], ctx["last_name"])
+        ctx["search_term"] = f"{ctx['first_name']} {ctx['last_name']}"
+        ctx["added_employee"] = ctx["search_term"]
+
+    def delete(self, ctx: Dict[str, Any]):
+        # Search results may include real employees, so only the name this journey created is deleted
+        name = _added_employee(ctx)
+        self.pim_page.navigate_to_pim()
+        self.pim_page.delete_employee(name)
+
+    def close(self):
+        self.driver.quit()
+
+
+ACTION_LEVELS = {"api": APIActions, "browser": BrowserActions}
+
+
+class ScenarioRunner:
+    """Runs weighted journeys from a Scenario and reports per-step latency and the achieved mix"""
+
+    def __init__(self, scenario: Scenario, level: str = "api", think: bool = True, seed: Optional[int] = None):
+        if level not in ACTION_LEVELS:
+            raise ValueError(f"Unsupported scenario level: {level}")
+        if scenario.data not in DATA_GENERATORS:
+            raise ValueError(f"Unknown data generator: {scenario.data}")
+        unknown = {s.action for j in scenario.journeys for s in j.steps} - set(ACTIONS)
+        if unknown:
+            raise ValueError(f"Unknown {level} actions: {', '.join(sorted(unknown))}")
+        self.scenario = scenario
+        self.level = level
+        self.think = think
+        self.seed = seed
+        self._lock = threading.Lock()
+        self.step_timings: Dict[str, List[float]] = {}
+        self.step_errors: Dict[str, int] = {}
+        self.journey_counts: Dict[str, int] = {j.name: 0 for j in scenario.journeys}
+        self.failed_journeys = 0
+
+    def run_journey(self, actions, rng: random.Random) -> bool:
+        """Pick a journey by weight and run its steps; returns False if a step failed"""
+        journey = rng.choices(self.scenario.journeys, weights=[j.weight for j in self.scenario.journeys])[0]
+        ctx = DATA_GENERATORS[self.scenario.data](rng, **self.scenario.data_options)
+        with self._lock:
+            self.journey_counts[journey.name] += 1
+        for step in journey.steps:
+            key = f"{journey.name}.{step.action}"
+            start_time = time.perf_counter()
+            ctx.update(step.params)
+            try:
+                getattr(actions, step.action)(ctx)
+                failed = False
+            except Exception as e:
+                logger.warning(f"Step {key} failed: {str(e)}")
+                failed = True
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            with self._lock:
+                self.step_timings.setdefault(key, []).append(elapsed_ms)
+                if failed:
+                    self.step_errors[key] = self.step_errors.get(key, 0) + 1
+                    self.failed_journeys += 1
+            if failed:
+                return False
+            if self.think:
+                time.sleep((step.think_time or self.scenario.think_time).sample(rng))
+        return True
+
+    def _virtual_user(self, user: int, iterations: Optional[int], deadline: Optional[float]):
+        rng = random.Random(None if self.seed is None else self.seed + user)
+        actions = ACTION_LEVELS[self.level]()
+        try:
+            done = 0
+            while (iterations is None or done < iterations) and (deadline is None or time.time() < deadline):
+                self.run_journey(actions, rng)
+                done += 1
+        finally:
+            actions.close()
+
+    def run(self, users: int = 1, iterations: Optional[int] = None, duration: Optional[float] = None) -> Dict[str, Any]:
+        """Run `users` concurrent virtual users for a number of journeys each or a duration"""
+        if iterations is None and duration is None:
+            raise ValueError("Either iterations or duration is required")
+        deadline = time.time() + duration if duration else None
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            for future in [executor.submit(self._virtual_user, u, iterations, deadline) for u in range(users)]:
+                future.result()
+        return self.report(time.time() - start_time)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        total_weight = sum(j.weight for j in self.scenario.journeys)
+        total_journeys = sum(self.journey_counts.values())
+        steps = {}
+        for key, timings in self.step_timings.items():
+            ordered = sorted(timings)
+            steps[key] = {
+                "count": len(timings),
+                "errors": self.step_errors.get(key, 0),
+                "mean_ms": statistics.mean(timings),
+                "p50_ms": ordered[int(0.50 * (len(ordered) - 1))],
+                "p95_ms": ordered[int(0.95 * (len(ordered) - 1))],
+                "max_ms": ordered[-1]
+            }
+        return {
+            "scenario": self.scenario.name,
+            "level": self.level,
+            "elapsed": elapsed,
+            "journeys": total_journeys,
+            "failed_journeys": self.failed_journeys,
+            "journeys_per_second": total_journeys / elapsed if elapsed else 0.0,
+            "mix": {
+                j.name: {
+                    "target": j.weight / total_weight,
+                    "achieved": self.journey_counts[j.name] / total_journeys if total_journeys else 0.0
+                }
+                for j in self.scenario.journeys
+            },
+            "steps": steps
+        }
+
+    @staticmethod
+    def save_report(report: Dict[str, Any], output_dir: Path = Path("results/performance")) -> Path:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_path = output_dir / f"scenario_{report['scenario']}_{timestamp}.json"
+        with open(report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        return report_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a weighted PIM workload scenario")
+    parser.add_argument("scenario", type=Path, help="scenario YAML/JSON file")
+    parser.add_argument("--level", choices=sorted(ACTION_LEVELS), default="api")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--iterations", type=int)
+    parser.add_argument("--duration", type=float)
+    parser.add_argument("--no-think", action="store_true", help="skip think times (smoke runs)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    runner = ScenarioRunner(load_scenario(args.scenario), level=args.level, think=not args.no_think, seed=args.seed)
+    report = runner.run(users=args.users, iterations=args.iterations,
+                        duration=args.duration if args.iterations is None else None)
+    print(json.dumps(report, indent=2))
+    print(f"Report saved: {ScenarioRunner.save_report(report)}")